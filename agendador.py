@@ -0,0 +1,147 @@
+# ============================================================
+# Agendador de extração concorrente com limites por domínio
+# ============================================================
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Limites padrão aplicados a cada domínio (requisições simultâneas e requisições/segundo)
+MAX_CONCORRENCIA_POR_HOST = 4
+TAXA_POR_HOST = 4.0
+
+
+class TokenBucket:
+    """Balde de fichas: libera no máximo `taxa` requisições por segundo, com rajadas de até `capacidade`."""
+
+    def __init__(self, taxa, capacidade=None):
+        self.taxa = float(taxa)
+        self.capacidade = float(capacidade if capacidade is not None else max(1.0, taxa))
+        self._fichas = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consumir(self):
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.taxa
+            time.sleep(espera)
+
+
+class LimitadorHosts:
+    """Limita concorrência e taxa de requisições separadamente para cada domínio."""
+
+    def __init__(self, max_concorrencia=MAX_CONCORRENCIA_POR_HOST, taxa=TAXA_POR_HOST):
+        self.max_concorrencia = max_concorrencia
+        self.taxa = taxa
+        self._por_host = {}
+        self._configurados = {}
+        self._lock = threading.Lock()
+
+    def configurar(self, host, max_concorrencia=None, taxa=None):
+        """Define limites específicos para um domínio (ex.: "www.megaleiloes.com.br")."""
+        with self._lock:
+            self._configurados[host] = (
+                max_concorrencia if max_concorrencia is not None else self.max_concorrencia,
+                taxa if taxa is not None else self.taxa,
+            )
+            self._por_host.pop(host, None)
+
+    def _limites(self, host):
+        with self._lock:
+            if host not in self._por_host:
+                max_concorrencia, taxa = self._configurados.get(host, (self.max_concorrencia, self.taxa))
+                self._por_host[host] = (threading.BoundedSemaphore(max_concorrencia), TokenBucket(taxa))
+            return self._por_host[host]
+
+    @contextmanager
+    def slot(self, url):
+        semaforo, bucket = self._limites(urlsplit(url).hostname or "")
+        with semaforo:
+            bucket.consumir()
+            yield
+
+
+limitador_padrao = LimitadorHosts()
+
+
+def executar_em_paralelo(funcao, itens, workers=4):
+    """Aplica funcao(indice, item) em até `workers` threads e devolve os resultados na ordem dos itens."""
+    itens = list(itens)
+    if workers <= 1:
+        return [funcao(i, item) for i, item in enumerate(itens, start=1)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extracao") as executor:
+        futuros = [executor.submit(funcao, i, item) for i, item in enumerate(itens, start=1)]
+        return [futuro.result() for futuro in futuros]
+
+
+_FIM = object()  # Sinaliza aos workers que a fila terminou
+
+
+def executar_pipeline(produtor, funcao, workers=4, tamanho_fila=None, ao_concluir=None, cancelar=None):
+    """Consome os itens de `produtor` enquanto ele ainda os gera (produtor/consumidor).
+
+    O produtor (ex.: a listagem de páginas) roda na thread atual e coloca os itens
+    numa fila limitada; `workers` threads aplicam funcao(indice, item) assim que
+    eles chegam. `ao_concluir(indice, resultado)` é chamado a cada item pronto.
+    Devolve os resultados na ordem em que o produtor gerou os itens.
+    `tamanho_fila` padrão é 4 itens por worker; 0 deixa a fila sem limite.
+
+    Quando o threading.Event `cancelar` é sinalizado, o produtor é encerrado, os
+    itens ainda na fila são descartados e os itens já em andamento terminam
+    normalmente; são devolvidos apenas os resultados concluídos.
+    """
+    workers = max(1, workers)
+    fila = queue.Queue(maxsize=workers * 4 if tamanho_fila is None else tamanho_fila)
+    resultados = {}
+    erros = []
+    lock = threading.Lock()
+
+    def consumir():
+        while True:
+            tarefa = fila.get()
+            if tarefa is _FIM:
+                return
+            indice, item = tarefa
+            if cancelar is not None and cancelar.is_set():
+                continue
+            try:
+                resultado = funcao(indice, item)
+                with lock:
+                    resultados[indice] = resultado
+                if ao_concluir is not None:
+                    ao_concluir(indice, resultado)
+            except BaseException as e:
+                with lock:
+                    erros.append(e)
+
+    threads = [
+        threading.Thread(target=consumir, name=f"extracao_{n}", daemon=True) for n in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for indice, item in enumerate(produtor, start=1):
+            if cancelar is not None and cancelar.is_set():
+                # Fecha o gerador da listagem (devolve o driver ao pool)
+                getattr(produtor, "close", lambda: None)()
+                break
+            fila.put((indice, item))
+    finally:
+        for _ in threads:
+            fila.put(_FIM)
+        for thread in threads:
+            thread.join()
+
+    if erros:
+        raise erros[0]
+    return [resultados[indice] for indice in sorted(resultados)]
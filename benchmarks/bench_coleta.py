@@ -0,0 +1,160 @@
+# ============================================================
+# Benchmark: coleta completa de cada site contra o site simulado
+# ============================================================
+# Uso: python benchmarks/bench_coleta.py [--sites megaleiloes alfaleiloes] [--paginas 5]
+#          [--latencia 0.05] [--taxa-erros 0.02] [--workers 8]
+#          [--salvar base.json] [--comparar base.json --tolerancia 0.15]
+#
+# Sobe o site simulado (site_simulado.py) e roda motor.raspar() de cada site contra
+# ele, cada um num processo separado (o pico de memória de um não contamina o do
+# outro). Relata lotes/s, latência por lote (p50/p95, do início da extração ao
+# registro pronto), pico de RSS do processo, erros e lotes faltando.
+#
+# Com --salvar os resultados viram a base de comparação; com --comparar a execução
+# falha (código 1) se a vazão cair ou o p95/RSS subirem além da tolerância.
+# A listagem usa o pool de Chrome (ver navegador.py), ou só HTTP com --listagem-http;
+# --sem-paginacao tira o paginador das listagens (total de páginas por sondagem).
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from site_simulado import SiteSimulado  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage
+    resource = None
+
+
+def pico_rss():
+    """Pico de memória residente do processo em MB (None se a plataforma não informa)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 / 1024 if sys.platform == "darwin" else pico / 1024  # bytes no macOS, KB no Linux
+
+
+def medir_site(site, base_url, workers, limite_host, pool=None, listagem_http=False):
+    """Roda a coleta de um site (no processo atual) e devolve as medições."""
+    import agendador
+    import motor
+    from perfil import PerfilTempo, definir_silencioso
+    from urllib.parse import urlsplit
+
+    adaptador = motor.carregar_adaptadores()[site]
+    adaptador.listagem_http = listagem_http
+    # Taxa alta o suficiente para que só o limite de concorrência do host atue
+    agendador.limitador_padrao.configurar(urlsplit(base_url).hostname, max_concorrencia=limite_host, taxa=10_000)
+    definir_silencioso()
+    perfil = PerfilTempo(amostrar=("lote",))
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            registros = motor.raspar(adaptador, "todas", base_url, pool=pool, workers=workers, perfil=perfil)
+    finally:
+        if pool is None:
+            motor.obter_pool().encerrar()
+    duracao = time.perf_counter() - inicio
+    contadores = perfil.contadores()
+    return {
+        "lotes": len(registros),
+        "extraidos": contadores.get(("lotes_extraidos", ()), 0),
+        "erros": sum(valor for (nome, _), valor in contadores.items() if nome.startswith("erro_")),
+        "duracao": duracao,
+        "lotes_por_segundo": len(registros) / duracao if duracao else 0.0,
+        "p50": perfil.percentil("lote", 50),
+        "p95": perfil.percentil("lote", 95),
+        "pico_rss_mb": pico_rss(),
+    }
+
+
+def _processo(fila, *args):
+    try:
+        fila.put(medir_site(*args))
+    except Exception as e:
+        fila.put({"erro": repr(e)})
+
+
+def medir_em_processo(*args):
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_processo, args=(fila, *args))
+    processo.start()
+    resultado = fila.get()
+    processo.join()
+    if "erro" in resultado:
+        raise RuntimeError(resultado["erro"])
+    return resultado
+
+
+def regressoes(resultados, base, tolerancia):
+    """Mensagens para cada métrica pior que a base além da tolerância (fração)."""
+    mensagens = []
+    for site, atual in resultados.items():
+        anterior = base.get(site)
+        if anterior is None:
+            continue
+        if atual["lotes_por_segundo"] < anterior["lotes_por_segundo"] * (1 - tolerancia):
+            mensagens.append(f"{site}: lotes/s {anterior['lotes_por_segundo']:.1f} -> {atual['lotes_por_segundo']:.1f}")
+        for metrica in ("p95", "pico_rss_mb"):
+            if atual[metrica] and anterior.get(metrica) and atual[metrica] > anterior[metrica] * (1 + tolerancia):
+                mensagens.append(f"{site}: {metrica} {anterior[metrica]:.3f} -> {atual[metrica]:.3f}")
+    return mensagens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da coleta contra o site simulado")
+    parser.add_argument("--sites", nargs="+", default=["megaleiloes", "alfaleiloes"])
+    parser.add_argument("--paginas", type=int, default=5)
+    parser.add_argument("--lotes-por-pagina", type=int, default=24)
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--variacao", type=float, default=0.02)
+    parser.add_argument("--taxa-erros", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--limite-host", type=int, default=8)
+    parser.add_argument("--listagem-http", action="store_true", help="lê as listagens sem o Chrome")
+    parser.add_argument("--sem-paginacao", action="store_true", help="listagens sem paginador (sondagem)")
+    parser.add_argument("--salvar", metavar="ARQUIVO", help="grava os resultados (JSON) como base de comparação")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="compara com uma base gravada por --salvar")
+    parser.add_argument("--tolerancia", type=float, default=0.15)
+    args = parser.parse_args()
+
+    resultados = {}
+    with SiteSimulado(args.paginas, args.lotes_por_pagina, args.latencia, args.variacao,
+                      args.taxa_erros, paginacao=not args.sem_paginacao) as simulado:
+        print(f"{'site':>12} {'lotes':>7} {'faltando':>9} {'erros':>6} {'lotes/s':>8} "
+              f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'pico RSS (MB)':>14}")
+        for site in args.sites:
+            r = medir_em_processo(site, simulado.base_url(site), args.workers, args.limite_host,
+                                  None, args.listagem_http)
+            faltando = simulado.lotes_esperados(site) - r["extraidos"]
+            rss = f"{r['pico_rss_mb']:.0f}" if r["pico_rss_mb"] is not None else "n/d"
+            p50 = r["p50"] * 1000 if r["p50"] is not None else float("nan")
+            p95 = r["p95"] * 1000 if r["p95"] is not None else float("nan")
+            print(f"{site:>12} {r['lotes']:>7} {faltando:>9} {r['erros']:>6} {r['lotes_por_segundo']:>8.1f} "
+                  f"{p50:>9.0f} {p95:>9.0f} {rss:>14}")
+            resultados[site] = r
+
+    if args.salvar:
+        Path(args.salvar).write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+        print(f"[INFO] Resultados gravados em: {args.salvar}")
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding="utf-8"))
+        mensagens = regressoes(resultados, base, args.tolerancia)
+        for mensagem in mensagens:
+            print(f"[REGRESSÃO] {mensagem}")
+        if mensagens:
+            sys.exit(1)
+        print("[OK] Nenhuma regressão acima da tolerância.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# ============================================================
+# Benchmark: extração concorrente das páginas de detalhe (site local simulado)
+# ============================================================
+# Uso: python benchmarks/bench_concorrencia.py [--lotes 64] [--latencia 0.05] [--limite-host 8]
+#
+# Sobe um servidor HTTP local que imita a página de lote da Mega Leilões com
+# latência artificial e mede lotes/segundo para diferentes números de workers.
+# A vazão deve crescer quase linearmente até o limite de concorrência do host.
+
+import argparse
+import contextlib
+import io
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import agendador  # noqa: E402
+import megaleiloes  # noqa: E402
+
+PAGINA_LOTE = """<html><body><div></div><div></div><div>
+<h1 class="section-header">Apartamento {n}</h1>
+<div class="batch-type">Judicial</div>
+<div class="value">R$ 100.000,00</div>
+<div class="description">Descrição do lote {n}</div>
+</div></body></html>"""
+
+
+def criar_servidor(latencia):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latencia)
+            corpo = PAGINA_LOTE.format(n=self.path.rsplit("/", 1)[-1]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    class Servidor(ThreadingHTTPServer):
+        request_queue_size = 128  # evita recusar conexões quando muitos workers conectam juntos
+
+    servidor = Servidor(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def medir(links, workers):
+    def processar(i, link):
+        return megaleiloes.extrair_imovel_http(link)
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados = agendador.executar_em_paralelo(processar, links, workers)
+    duracao = time.perf_counter() - inicio
+    assert [r["link"] for r in resultados] == links, "resultados fora da ordem da listagem"
+    return duracao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração concorrente das páginas de detalhe")
+    parser.add_argument("--lotes", type=int, default=64)
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--limite-host", type=int, default=8)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.latencia)
+    host, porta = servidor.server_address
+    # Taxa alta o suficiente para que só o limite de concorrência do host atue
+    agendador.limitador_padrao.configurar(host, max_concorrencia=args.limite_host, taxa=10_000)
+    links = [f"http://{host}:{porta}/lote/{n}" for n in range(1, args.lotes + 1)]
+
+    print(f"{'workers':>8} {'tempo (s)':>10} {'lotes/s':>9} {'speedup':>8}")
+    base = None
+    for workers in (1, 2, 4, 8, 16):
+        duracao = medir(links, workers)
+        base = base or duracao
+        print(f"{workers:>8} {duracao:>10.2f} {args.lotes / duracao:>9.1f} {base / duracao:>7.1f}x")
+
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# ============================================================
+# Benchmark: deduplicação de lotes entre sites (dados sintéticos)
+# ============================================================
+# Uso: python benchmarks/bench_deduplicacao.py [--lotes 50000] [--duplicados 0.3]
+#
+# Gera lotes sintéticos da Mega e da Alfa. Uma fração deles é o mesmo imóvel
+# anunciado nos dois sites, com a descrição levemente alterada e às vezes sem
+# número de processo. O benchmark mede o tempo da deduplicação e a
+# precisão/revocação dos pares encontrados para tamanhos crescentes. Com o índice
+# (processo + LSH) o tempo deve crescer quase linearmente.
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import deduplicacao  # noqa: E402
+
+TIPOS = ["Apartamento", "Casa", "Terreno", "Sala comercial", "Galpão", "Chácara", "Loja"]
+BAIRROS = ["Moema", "Centro", "Jardim América", "Vila Nova", "Santa Cecília", "Boa Vista", "Itaim", "Lapa"]
+CIDADES = ["São Paulo", "Campinas", "Santos", "Curitiba", "Belo Horizonte", "Porto Alegre", "Recife"]
+VOCABULARIO = ("sala cozinha banheiro dormitório suíte vaga garagem área útil privativa total terreno "
+               "matrícula cartório registro imóveis ocupado desocupado condomínio rua avenida número "
+               "andar edifício bloco unidade lavanderia quintal piscina churrasqueira varanda").split()
+
+
+def processo_cnj(gerador):
+    return (f"{gerador.randrange(10**7):07d}-{gerador.randrange(100):02d}."
+            f"{gerador.randrange(2000, 2025)}.8.{gerador.randrange(1, 28):02d}.{gerador.randrange(10**4):04d}")
+
+
+def descricao(gerador):
+    palavras = [gerador.choice(VOCABULARIO) for _ in range(gerador.randrange(25, 60))]
+    return (f"{gerador.choice(TIPOS)} com {gerador.randrange(40, 400)} m² no bairro {gerador.choice(BAIRROS)}, "
+            f"{gerador.choice(CIDADES)}. " + " ".join(palavras))
+
+
+def variar(texto, gerador):
+    # Troca algumas palavras, como faz a redação de cada leiloeiro
+    palavras = texto.split()
+    for _ in range(max(1, len(palavras) // 20)):
+        palavras[gerador.randrange(len(palavras))] = gerador.choice(VOCABULARIO)
+    return " ".join(palavras)
+
+
+def gerar_lotes(total, fracao_duplicados, semente=7):
+    """Lista de lotes (metade de cada site) e o conjunto de pares (link_mega, link_alfa) duplicados."""
+    gerador = random.Random(semente)
+    lotes, esperados = [], set()
+    por_site = total // 2
+    duplicados = int(por_site * fracao_duplicados)
+    for n in range(por_site):
+        texto, processo = descricao(gerador), processo_cnj(gerador)
+        titulo = texto.split(",")[0]
+        lotes.append({"site": "megaleiloes", "link": f"https://mega/{n}", "titulo_leilao": titulo,
+                      "numero_processo": processo, "descricao_lote": texto})
+        if n < duplicados:
+            sem_processo = gerador.random() < 0.3
+            lotes.append({"site": "alfaleiloes", "link": f"https://alfa/{n}", "titulo_leilao": titulo.upper(),
+                          "numero_processo": None if sem_processo else processo.replace("-", "").replace(".", ""),
+                          "descricao_lote": variar(texto, gerador)})
+            esperados.add((f"https://mega/{n}", f"https://alfa/{n}"))
+        else:
+            texto = descricao(gerador)
+            lotes.append({"site": "alfaleiloes", "link": f"https://alfa/{n}", "titulo_leilao": texto.split(",")[0],
+                          "numero_processo": processo_cnj(gerador), "descricao_lote": texto})
+    return lotes, esperados
+
+
+def medir(total, fracao_duplicados):
+    lotes, esperados = gerar_lotes(total, fracao_duplicados)
+    inicio = time.perf_counter()
+    mesclados, removidos = deduplicacao.deduplicar_lotes(lotes)
+    duracao = time.perf_counter() - inicio
+    encontrados = set()
+    for registro in mesclados:
+        links = {fonte["site"]: fonte["link"] for fonte in registro["fontes"]}
+        if len(links) == 2:
+            encontrados.add((links["megaleiloes"], links["alfaleiloes"]))
+    acertos = len(encontrados & esperados)
+    precisao = acertos / len(encontrados) if encontrados else 1.0
+    revocacao = acertos / len(esperados) if esperados else 1.0
+    return duracao, removidos, precisao, revocacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da deduplicação de lotes entre sites")
+    parser.add_argument("--lotes", type=int, default=50000)
+    parser.add_argument("--duplicados", type=float, default=0.3, help="fração dos lotes presente nos dois sites")
+    args = parser.parse_args()
+
+    print(f"{'lotes':>8} {'tempo (s)':>10} {'lotes/s':>9} {'removidos':>10} {'precisão':>9} {'revocação':>10}")
+    for divisor in (8, 4, 2, 1):
+        tamanho = max(args.lotes // divisor, 2)
+        duracao, removidos, precisao, revocacao = medir(tamanho, args.duplicados)
+        print(f"{tamanho:>8} {duracao:>10.2f} {tamanho / duracao:>9.0f} {removidos:>10} "
+              f"{precisao:>9.1%} {revocacao:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# ============================================================
+# Benchmark: perfil "padrao" x "enxuto" do Chrome (site local simulado)
+# ============================================================
+# Uso: python benchmarks/bench_navegador.py [--paginas 10] [--latencia-recursos 0.1]
+#
+# Sobe um servidor HTTP local com páginas de listagem no formato da Mega Leilões
+# que, como as reais, carregam imagens, uma fonte, um vídeo e um script de
+# "analytics" de outro domínio (servido em localhost, enquanto a página está em
+# 127.0.0.1). Para cada perfil mede o tempo até os cards estarem prontos e os
+# bytes/requisições que o servidor entregou por página.
+# Requer o Chrome e o ChromeDriver (ver navegador.py).
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+
+import megaleiloes  # noqa: E402
+import navegador  # noqa: E402
+
+CARDS_POR_PAGINA = 24
+
+PAGINA_LISTAGEM = """<html><head>
+<style>@font-face {{ font-family: Site; src: url(/static/fonte.woff2); }} body {{ font-family: Site; }}</style>
+<script src="http://localhost:{porta}/rastreador.js"></script>
+</head><body>
+<video src="/static/video.mp4" autoplay muted></video>
+{cards}
+</body></html>"""
+
+CARD = """<div class="col-sm-6 col-md-4 col-lg-3">
+<img src="/static/foto-{pagina}-{n}.jpg">
+<div class="card-status">Aberto</div>
+<a class="card-title" href="/lote/{pagina}-{n}">Lote {n}</a>
+</div>"""
+
+# Tamanho dos recursos estáticos (bytes), parecidos com os das páginas reais
+TAMANHOS = {".jpg": 150_000, ".woff2": 60_000, ".mp4": 1_500_000, ".js": 80_000}
+
+
+def criar_servidor(latencia_recursos):
+    contadores = {"bytes": 0, "requisicoes": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            porta = self.server.server_address[1]
+            if self.path.startswith("/listagem/"):
+                pagina = self.path.rsplit("/", 1)[-1]
+                cards = "\n".join(CARD.format(pagina=pagina, n=n) for n in range(CARDS_POR_PAGINA))
+                corpo = PAGINA_LISTAGEM.format(porta=porta, cards=cards).encode("utf-8")
+                tipo = "text/html; charset=utf-8"
+            else:
+                time.sleep(latencia_recursos)
+                extensao = "." + self.path.rsplit(".", 1)[-1]
+                corpo = b"\0" * TAMANHOS.get(extensao, 1000)
+                tipo = "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            try:
+                self.wfile.write(corpo)
+            except (BrokenPipeError, ConnectionResetError):
+                return  # o navegador desistiu do recurso (ex.: vídeo)
+            with lock:
+                contadores["bytes"] += len(corpo)
+                contadores["requisicoes"] += 1
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, contadores, lock
+
+
+def medir(perfil, servidor, contadores, lock, paginas):
+    host, porta = servidor.server_address
+    # No perfil enxuto, localhost faz o papel dos domínios de terceiros
+    driver = navegador.criar_driver(perfil, bloquear=[f"*://localhost:{porta}/*"])
+    try:
+        tempos, bytes_pagina, requisicoes = [], [], []
+        for pagina in range(1, paginas + 1):
+            time.sleep(0.2)  # deixa terminar recursos atrasados da página anterior
+            with lock:
+                contadores["bytes"] = contadores["requisicoes"] = 0
+            inicio = time.perf_counter()
+            driver.get(f"http://{host}:{porta}/listagem/{pagina}")
+            pronto = navegador.aguardar(driver, EC.presence_of_element_located((By.XPATH, megaleiloes.XPATH_CARDS)))
+            tempos.append(time.perf_counter() - inicio)
+            assert pronto is not None, "cards não apareceram"
+            time.sleep(0.2)
+            with lock:
+                bytes_pagina.append(contadores["bytes"])
+                requisicoes.append(contadores["requisicoes"])
+    finally:
+        driver.quit()
+    return statistics.median(tempos), statistics.mean(bytes_pagina), statistics.mean(requisicoes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos perfis \"padrao\" e \"enxuto\" do Chrome")
+    parser.add_argument("--paginas", type=int, default=10)
+    parser.add_argument("--latencia-recursos", type=float, default=0.1,
+                        help="atraso (s) de cada imagem, fonte, vídeo e script de terceiros")
+    args = parser.parse_args()
+
+    servidor, contadores, lock = criar_servidor(args.latencia_recursos)
+    print(f"{'perfil':>8} {'pronto p50 (ms)':>16} {'KB/página':>10} {'requisições/página':>19}")
+    for perfil in navegador.PERFIS:
+        tempo, volume, requisicoes = medir(perfil, servidor, contadores, lock, args.paginas)
+        print(f"{perfil:>8} {tempo * 1000:>16.0f} {volume / 1024:>10.0f} {requisicoes:>19.1f}")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# ============================================================
+# Site de leilões simulado (servidor HTTP local para benchmarks)
+# ============================================================
+# Uso: python benchmarks/site_simulado.py [--porta 8000] [--paginas 5] [--latencia 0.05] [--taxa-erros 0.02]
+#
+# Serve listagens e páginas de lote sintéticas com a mesma marcação que os
+# adaptadores esperam, para medir a coleta sem acessar os sites reais:
+#   /mega/imoveis?pagina=N     cards "col-sm-6 col-md-4 col-lg-3" com "card-status" e "card-title"
+#   /mega/lote/P-N             "section-header", "batch-type", "value", "description" e os
+#                              links de Edital/Laudo/Matrícula nos XPaths absolutos do site
+#   /alfa/leiloes/?page=N      "cards-wrapper" > "home-leiloes-cards" com "card-status" e "btn-card"
+#   /alfa/lote/P-N             "title-lote-leiloes", #lotes, "line-through", "content" e o
+#                              modal "modal-body-doc" com os documentos
+#   /docs/NOME.pdf             documento dos lotes (o edital é o mesmo para toda a página),
+#                              com ETag e suporte a Range (downloads retomáveis); o laudo, a
+#                              matrícula e a certidão de débitos têm texto com avaliação, área,
+#                              número da matrícula e débitos
+# Páginas depois da última voltam sem cards, como nos sites reais. Com `paginacao`
+# as listagens trazem o paginador ("ul.pagination", com o link da última página);
+# sem ele a coleta precisa descobrir o total de páginas por sondagem.
+#
+# `latencia` (+ até `variacao` aleatória) atrasa cada resposta e `taxa_erros` é a
+# fração das páginas de lote respondidas com HTTP 503 (e dos documentos cortados
+# no meio da transferência). Os dados são gerados a
+# partir da semente, então a mesma configuração sempre produz os mesmos lotes.
+
+import argparse
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TIPOS = ["Apartamento", "Casa", "Terreno", "Sala comercial", "Galpão", "Chácara", "Loja"]
+BAIRROS = ["Moema", "Centro", "Jardim América", "Vila Nova", "Santa Cecília", "Boa Vista", "Itaim", "Lapa"]
+CIDADES = ["São Paulo", "Campinas", "Santos", "Curitiba", "Belo Horizonte", "Porto Alegre", "Recife"]
+STATUS_MEGA = ["Aberto", "Aberto", "Em breve", "Encerrado"]
+STATUS_ALFA = ["Aberto", "Aberto", "Aberto", "Vendido"]
+
+PAGINA = "<html><head><meta charset=\"utf-8\"><title>{titulo}</title></head><body>{corpo}</body></html>"
+
+CARD_MEGA = """<div class="col-sm-6 col-md-4 col-lg-3"><div class="card">
+<div class="card-status">{status}</div>
+<a class="card-title" href="/mega/lote/{pagina}-{n}">{titulo}</a>
+<div class="card-price">{valor}</div>
+</div></div>"""
+
+# Estrutura aninhada reproduzindo os XPaths absolutos de CAMPOS_DETALHE em megaleiloes.py
+LOTE_MEGA = """<div></div><div></div>
+<div>
+  <div></div><div></div>
+  <div>
+    <div>
+      <h1 class="section-header">{titulo}</h1>
+      <div class="batch-type">{tipo}</div>
+      <div class="value">{valor}</div>
+      <div class="description">{descricao}</div>
+    </div>
+    <div>
+      <div></div>
+      <div><div><div>
+        <div></div>
+        <div><div><div>Processo</div><div><a href="/processo/{processo}">{processo}</a></div></div></div>
+      </div></div></div>
+    </div>
+    <div>
+      <div></div><div></div>
+      <div>
+        <div></div>
+        <div>
+          <a href="/mega/lote/{pagina}-{n}#fotos">Fotos</a>
+          <a href="/docs/edital-mega-{pagina}.pdf">Edital</a>
+          <a href="/docs/laudo-mega-{pagina}-{n}.pdf">Laudo de Avaliação</a>
+          <a href="/docs/matricula-mega-{pagina}-{n}.pdf">Matrícula</a>
+        </div>
+      </div>
+    </div>
+  </div>
+</div>"""
+
+CARD_ALFA = """<div class="home-leiloes-cards">
+<div class="card-status"><p>{status}</p></div>
+<h3>{titulo}</h3>
+<a class="btn-card" href="/alfa/lote/{pagina}-{n}">Ver lote</a>
+</div>"""
+
+# Estrutura reproduzindo os XPaths de CAMPOS_DETALHE em alfaleiloes.py
+LOTE_ALFA = """<div class="header"></div>
+<section id="lotes">
+  <div><div>
+    <h1>{tipo}</h1>
+    <div class="title-lote-leiloes">{titulo}</div>
+    <div><span class="line-through">{valor}</span></div>
+    <div><a href="/docs/edital-alfa-{pagina}.pdf">Edital</a> <a href="#" data-toggle="modal">Documentos</a></div>
+    <div><div><p>Processo</p><a href="/processo/{processo}">{processo}</a></div></div>
+  </div></div>
+  <div class="content">{descricao}</div>
+</section>
+<div class="modal"><div class="modal-body-doc">
+  <a href="/docs/matricula-alfa-{pagina}-{n}.pdf">Certidão de Matrícula</a>
+  <a href="/docs/laudo-alfa-{pagina}-{n}.pdf">Laudo de Avaliação</a>
+  <a href="/docs/debitos-alfa-{pagina}-{n}.pdf">Débitos Tributários</a>
+  <a href="/docs/exequendo-alfa-{pagina}-{n}.pdf">Débito Exequendo/Condominial</a>
+  <a href="/docs/edital-alfa-{pagina}.pdf">Manual de Participação</a>
+</div></div>"""
+
+
+def gerar_lote(semente, site, pagina, n):
+    """Dados sintéticos (determinísticos) de um lote."""
+    gerador = random.Random(f"{semente}-{site}-{pagina}-{n}")
+    tipo = gerador.choice(TIPOS)
+    area = gerador.randrange(40, 400)
+    bairro, cidade = gerador.choice(BAIRROS), gerador.choice(CIDADES)
+    valor = gerador.randrange(50, 3000) * 1000
+    return {
+        "titulo": f"{tipo} {area} m² - {bairro}, {cidade}",
+        "tipo": gerador.choice(["Judicial", "Extrajudicial"]),
+        "valor": f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        "processo": (f"{gerador.randrange(10**7):07d}-{gerador.randrange(100):02d}."
+                     f"{gerador.randrange(2000, 2025)}.8.26.{gerador.randrange(10**4):04d}"),
+        "descricao": (f"{tipo} com {area} m² de área privativa no bairro {bairro}, {cidade}. "
+                      f"Matrícula nº {gerador.randrange(10**5, 10**6)} do {gerador.randrange(1, 18)}º "
+                      f"Cartório de Registro de Imóveis. Imóvel {gerador.choice(['ocupado', 'desocupado'])}."),
+        "status_mega": gerador.choice(STATUS_MEGA),
+        "status_alfa": gerador.choice(STATUS_ALFA),
+    }
+
+
+class SiteSimulado:
+    """Servidor local dos dois sites. Use como gerenciador de contexto ou com iniciar()/encerrar()."""
+
+    def __init__(self, paginas=5, lotes_por_pagina=24, latencia=0.05, variacao=0.0, taxa_erros=0.0,
+                 semente=0, porta=0, paginacao=True):
+        self.paginas = paginas
+        self.paginacao = paginacao
+        self.lotes_por_pagina = lotes_por_pagina
+        self.latencia = latencia
+        self.variacao = variacao
+        self.taxa_erros = taxa_erros
+        self.semente = semente
+        self.porta = porta
+        self.requisicoes = 0
+        self.erros = 0
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self._servidor = None
+
+    # URLs de listagem com o marcador {page}, como AdaptadorSite.base_url
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address
+        return f"http://{host}:{porta}"
+
+    def base_url(self, site):
+        caminho = {"megaleiloes": "/mega/imoveis?pagina={page}", "alfaleiloes": "/alfa/leiloes/?page={page}"}
+        return self.url + caminho[site]
+
+    def lotes_esperados(self, site):
+        """Quantos lotes a coleta do site deve devolver (a Alfa ignora os vendidos)."""
+        total = 0
+        for pagina in range(1, self.paginas + 1):
+            for n in range(1, self.lotes_por_pagina + 1):
+                if site != "alfaleiloes" or gerar_lote(self.semente, "alfa", pagina, n)["status_alfa"] != "Vendido":
+                    total += 1
+        return total
+
+    def iniciar(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/docs/"):
+                    status, cabecalhos, corpo, enviar = site.responder_documento(self.path, self.headers.get("Range"))
+                else:
+                    status, tipo, corpo = site.responder(self.path)
+                    cabecalhos, enviar = {"Content-Type": tipo}, len(corpo)
+                self.send_response(status)
+                for nome, valor in cabecalhos.items():
+                    self.send_header(nome, valor)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                try:
+                    self.wfile.write(corpo[:enviar])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                if enviar < len(corpo):
+                    self.close_connection = True  # conexão cai no meio do arquivo
+
+            def log_message(self, *args):
+                pass
+
+        class Servidor(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128  # evita recusar conexões quando muitos workers conectam juntos
+
+        self._servidor = Servidor(("127.0.0.1", self.porta), Handler)
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def encerrar(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    # ------------------------------------------------------------------
+    # Respostas
+    # ------------------------------------------------------------------
+
+    def _sortear(self):
+        # Conta a requisição, aplica a latência e diz se ela deve falhar
+        with self._lock:
+            self.requisicoes += 1
+            atraso = self.latencia + self._aleatorio.uniform(0, self.variacao)
+            falhar = self._aleatorio.random() < self.taxa_erros
+            if falhar:
+                self.erros += 1
+        time.sleep(atraso)
+        return falhar
+
+    def responder(self, caminho):
+        """(status HTTP, Content-Type, corpo) para o caminho pedido."""
+        falhar = self._sortear()
+
+        partes = urlsplit(caminho)
+        consulta = parse_qs(partes.query)
+        html = "text/html; charset=utf-8"
+        if partes.path == "/mega/imoveis":
+            return 200, html, self.listagem("mega", int(consulta.get("pagina", ["1"])[0]))
+        if partes.path == "/alfa/leiloes/":
+            return 200, html, self.listagem("alfa", int(consulta.get("page", ["1"])[0]))
+        if partes.path.startswith(("/mega/lote/", "/alfa/lote/")):
+            if falhar:
+                return 503, html, b"<html><body>Servico indisponivel</body></html>"
+            site = partes.path.split("/")[1]
+            pagina, n = (int(x) for x in partes.path.rsplit("/", 1)[-1].split("-"))
+            return 200, html, self.detalhe(site, pagina, n)
+        return 404, html, b"<html><body>Nao encontrado</body></html>"
+
+    def listagem(self, site, pagina):
+        cards = []
+        if pagina <= self.paginas:
+            for n in range(1, self.lotes_por_pagina + 1):
+                lote = gerar_lote(self.semente, site, pagina, n)
+                modelo = CARD_MEGA if site == "mega" else CARD_ALFA
+                cards.append(modelo.format(pagina=pagina, n=n, status=lote[f"status_{site}"], **lote))
+        if site == "mega":
+            corpo = f'<div class="row">{"".join(cards)}</div>'
+        else:
+            # Página após a última: sem o cards-wrapper, como no site real
+            corpo = f'<div class="cards-wrapper">{"".join(cards)}</div>' if cards else "<p>Nenhum lote</p>"
+        if self.paginacao and cards:
+            corpo += self.paginador(site, pagina)
+        return PAGINA.format(titulo=f"Listagem {pagina}", corpo=corpo).encode("utf-8")
+
+    def paginador(self, site, pagina):
+        # Janela de até 5 páginas em volta da atual e o link "Última", como nos sites reais
+        parametro = "/mega/imoveis?pagina=" if site == "mega" else "/alfa/leiloes/?&page="
+        janela = range(max(1, pagina - 2), min(self.paginas, pagina + 2) + 1)
+        itens = "".join(f'<li><a href="{parametro}{n}">{n}</a></li>' for n in janela)
+        itens += f'<li><a href="{parametro}{self.paginas}">Última</a></li>'
+        return f'<ul class="pagination">{itens}</ul>'
+
+    def detalhe(self, site, pagina, n):
+        lote = gerar_lote(self.semente, site, pagina, n)
+        modelo = LOTE_MEGA if site == "mega" else LOTE_ALFA
+        corpo = modelo.format(pagina=pagina, n=n, **lote)
+        return PAGINA.format(titulo=lote["titulo"], corpo=corpo).encode("utf-8")
+
+    def responder_documento(self, caminho, intervalo=None):
+        """(status, cabeçalhos, corpo, bytes enviados antes de cortar a conexão) de um documento."""
+        falhar = self._sortear()
+        conteudo = self.documento(urlsplit(caminho).path)
+        cabecalhos = {"Content-Type": "application/pdf", "ETag": f'"{zlib.crc32(conteudo):08x}"'}
+        status, inicio = 200, 0
+        if intervalo and intervalo.startswith("bytes=") and intervalo.endswith("-"):
+            inicio = int(intervalo[len("bytes="):-1])
+            if inicio >= len(conteudo):
+                return 416, {"Content-Range": f"bytes */{len(conteudo)}"}, b"", 0
+            status = 206
+            cabecalhos["Content-Range"] = f"bytes {inicio}-{len(conteudo) - 1}/{len(conteudo)}"
+        corpo = conteudo[inicio:]
+        return status, cabecalhos, corpo, len(corpo) // 2 if falhar else len(corpo)
+
+    def documento(self, caminho):
+        # Conteúdo estável por documento (mesmo caminho = mesmos bytes); o edital de uma
+        # página é o mesmo arquivo nos dois sites, publicado em URLs diferentes
+        if caminho.startswith("/docs/edital-"):
+            caminho = caminho.replace("-mega-", "-").replace("-alfa-", "-")
+        semente = zlib.crc32(caminho.encode("utf-8"))
+        return gerar_pdf(texto_documento(caminho, semente), random.Random(semente).randbytes(20_000))
+
+
+def reais(valor):
+    return "R$ " + f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def texto_documento(caminho, semente):
+    """Linhas de texto de um documento, com os dados que textos_documentos.py procura."""
+    aleatorio = random.Random(semente)
+    tipo = caminho.rsplit("/", 1)[-1].split("-", 1)[0]
+    avaliacao = aleatorio.randrange(80, 2_000) * 1_000
+    area = aleatorio.randrange(300, 5_000) / 10
+    matricula = aleatorio.randrange(1_000, 250_000)
+    iptu = aleatorio.randrange(10_000, 900_000) / 100
+    linhas = {
+        "laudo": [f"LAUDO DE AVALIAÇÃO - {caminho}",
+                  f"Área privativa: {area:.1f} m²".replace(".", ","),
+                  f"O imóvel foi avaliado em {reais(avaliacao)}"],
+        "matricula": [f"CERTIDÃO DE MATRÍCULA - {caminho}",
+                      f"Matrícula nº {matricula:,}".replace(",", "."),
+                      "Registro de Imóveis da Comarca"],
+        "debitos": [f"CERTIDÃO DE DÉBITOS - {caminho}",
+                    f"Débitos de IPTU: {reais(iptu)}"],
+        "exequendo": [f"DÉBITO EXEQUENDO - {caminho}", "Sem débitos condominiais informados."],
+    }
+    return linhas.get(tipo, [f"EDITAL DE LEILÃO - {caminho}", "Condições gerais de venda dos lotes."])
+
+
+def gerar_pdf(linhas, preenchimento=b""):
+    """PDF mínimo (uma página, Helvetica) com as linhas de texto; `preenchimento` vai num stream à parte."""
+    def escapar(linha):
+        return linha.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("cp1252")
+
+    conteudo = b"BT /F1 12 Tf 14 TL 72 760 Td " + b"".join(b"(" + escapar(linha) + b") ' " for linha in linhas) + b"ET"
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d >>\nstream\n" % len(preenchimento) + preenchimento + b"\nendstream",
+    ]
+    pdf, posicoes = b"%PDF-1.4\n", []
+    for numero, objeto in enumerate(objetos, 1):
+        posicoes.append(len(pdf))
+        pdf += b"%d 0 obj\n" % numero + objeto + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % posicao for posicao in posicoes)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Site de leilões simulado para benchmarks")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--paginas", type=int, default=5)
+    parser.add_argument("--lotes-por-pagina", type=int, default=24)
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--variacao", type=float, default=0.0)
+    parser.add_argument("--taxa-erros", type=float, default=0.0)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--sem-paginacao", action="store_true", help="listagens sem o paginador")
+    args = parser.parse_args()
+
+    site = SiteSimulado(args.paginas, args.lotes_por_pagina, args.latencia, args.variacao,
+                        args.taxa_erros, args.semente, args.porta, not args.sem_paginacao).iniciar()
+    print(f"[INFO] Mega Leilões: {site.base_url('megaleiloes')}")
+    print(f"[INFO] Alfa Leilões: {site.base_url('alfaleiloes')}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        site.encerrar()
+
+
+if __name__ == "__main__":
+    main()
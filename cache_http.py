@@ -0,0 +1,128 @@
+# ============================================================
+# Cache HTTP em disco (TTL, LRU por tamanho e revalidação condicional)
+# ============================================================
+# Cada página baixada via HTTP fica num SQLite local, indexada pela URL.
+# Dentro do TTL a resposta vem do disco; depois dele a página é revalidada com
+# If-None-Match / If-Modified-Since quando o servidor informou ETag ou
+# Last-Modified (304 = reaproveita o corpo salvo). Quando o cache passa do
+# tamanho máximo, as entradas acessadas há mais tempo são removidas.
+
+import os
+import sqlite3
+import threading
+import time
+
+TTL_PADRAO = 6 * 3600  # segundos
+TAMANHO_MAX_PADRAO = 500 * 1024 * 1024  # bytes
+
+
+class CacheHTTP:
+    def __init__(self, caminho, ttl=TTL_PADRAO, tamanho_max=TAMANHO_MAX_PADRAO):
+        if os.path.isdir(caminho):
+            caminho = os.path.join(caminho, "cache_http.db")
+        self.caminho = caminho
+        self.ttl = ttl
+        self.tamanho_max = tamanho_max
+        self.acertos = 0
+        self.revalidados = 0
+        self.faltas = 0
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS respostas (
+                    url TEXT PRIMARY KEY,
+                    url_final TEXT NOT NULL,
+                    corpo BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    armazenado_em REAL NOT NULL,
+                    ultimo_acesso REAL NOT NULL,
+                    tamanho INTEGER NOT NULL
+                )"""
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS respostas_acesso ON respostas (ultimo_acesso)")
+            self._tamanho_total = self._conexao.execute(
+                "SELECT COALESCE(SUM(tamanho), 0) FROM respostas"
+            ).fetchone()[0]
+
+    def obter(self, url, baixar):
+        """Devolve (conteúdo, url_final) do cache ou chamando baixar(cabecalhos) -> requests.Response."""
+        agora = time.time()
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT url_final, corpo, etag, last_modified, armazenado_em FROM respostas WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if linha is not None and agora - linha[4] < self.ttl:
+                with self._conexao:
+                    self._conexao.execute("UPDATE respostas SET ultimo_acesso = ? WHERE url = ?", (agora, url))
+                self.acertos += 1
+                return linha[1], linha[0]
+
+        # Entrada vencida: revalida se o servidor informou ETag/Last-Modified
+        cabecalhos = {}
+        if linha is not None:
+            if linha[2]:
+                cabecalhos["If-None-Match"] = linha[2]
+            if linha[3]:
+                cabecalhos["If-Modified-Since"] = linha[3]
+        resposta = baixar(cabecalhos or None)
+
+        if resposta.status_code == 304 and linha is not None:
+            with self._lock, self._conexao:
+                self._conexao.execute(
+                    "UPDATE respostas SET armazenado_em = ?, ultimo_acesso = ? WHERE url = ?",
+                    (time.time(), time.time(), url),
+                )
+                self.revalidados += 1
+            return linha[1], linha[0]
+
+        resposta.raise_for_status()
+        self._armazenar(url, resposta)
+        with self._lock:
+            self.faltas += 1
+        return resposta.content, resposta.url
+
+    def _armazenar(self, url, resposta):
+        corpo = resposta.content
+        agora = time.time()
+        with self._lock, self._conexao:
+            anterior = self._conexao.execute("SELECT tamanho FROM respostas WHERE url = ?", (url,)).fetchone()
+            self._conexao.execute(
+                """INSERT OR REPLACE INTO respostas
+                   (url, url_final, corpo, etag, last_modified, armazenado_em, ultimo_acesso, tamanho)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (url, resposta.url, corpo, resposta.headers.get("ETag"),
+                 resposta.headers.get("Last-Modified"), agora, agora, len(corpo)),
+            )
+            self._tamanho_total += len(corpo) - (anterior[0] if anterior else 0)
+            self._despejar()
+
+    def _despejar(self):
+        # LRU: remove as entradas acessadas há mais tempo até caber no tamanho máximo
+        while self._tamanho_total > self.tamanho_max:
+            linha = self._conexao.execute(
+                "SELECT url, tamanho FROM respostas ORDER BY ultimo_acesso LIMIT 1"
+            ).fetchone()
+            if linha is None:
+                self._tamanho_total = 0
+                break
+            self._conexao.execute("DELETE FROM respostas WHERE url = ?", (linha[0],))
+            self._tamanho_total -= linha[1]
+
+    def relatorio(self):
+        total = self.acertos + self.revalidados + self.faltas
+        if total == 0:
+            return "Cache HTTP: nenhuma requisição"
+        return (
+            f"Cache HTTP: {total} requisições | acertos {self.acertos} ({self.acertos / total:.0%}) | "
+            f"revalidados (304) {self.revalidados} ({self.revalidados / total:.0%}) | "
+            f"faltas {self.faltas} ({self.faltas / total:.0%}) | "
+            f"{self._tamanho_total / 1024 / 1024:.1f} MB em disco"
+        )
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
@@ -0,0 +1,120 @@
+# ============================================================
+# Especificação declarativa dos campos e extração em lote
+# ============================================================
+# Cada site descreve seus campos como {nome: campo(xpath_principal, *fallbacks, atributo=...)}.
+# A mesma especificação é avaliada:
+#   - no navegador, numa única chamada execute_script (um round trip por página);
+#   - no HTML baixado via HTTP, com lxml.
+# Sem atributo, o valor é o texto visível do elemento; com atributo (ex.: "href"), o valor do atributo.
+# As duas formas também devolvem o tempo gasto em cada campo (métrica "campo" do perfil).
+
+import time
+
+from coleta_http import texto_elemento
+from perfil import detalhe
+
+
+def campo(*xpaths, atributo=None):
+    return {"xpaths": list(xpaths), "atributo": atributo}
+
+
+# Avalia a especificação (arguments[0]) na página inteira ou, se arguments[1] for o
+# XPath dos cards, em cada card, e devolve tudo num único objeto JSON.
+SCRIPT_EXTRACAO = """
+var spec = arguments[0], xpathCards = arguments[1];
+function primeiro(xpath, ctx) {
+  return document.evaluate(xpath, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function valor(el, atributo) {
+  if (!atributo) return (el.innerText || el.textContent || "").trim();
+  var v = (atributo in el) ? el[atributo] : el.getAttribute(atributo);
+  return v == null ? null : String(v);
+}
+function avaliar(ctx) {
+  var valores = {}, origem = {}, tempos = {};
+  for (var nome in spec) {
+    var inicio = performance.now();
+    valores[nome] = null;
+    origem[nome] = null;
+    var xpaths = spec[nome].xpaths;
+    for (var i = 0; i < xpaths.length; i++) {
+      var el = null;
+      try { el = primeiro(xpaths[i], ctx); } catch (e) {}
+      if (el) { valores[nome] = valor(el, spec[nome].atributo); origem[nome] = i; break; }
+    }
+    tempos[nome] = (performance.now() - inicio) / 1000;
+  }
+  return {valores: valores, origem: origem, tempos: tempos};
+}
+if (!xpathCards) return avaliar(document);
+var cards = document.evaluate(xpathCards, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var lista = [];
+for (var k = 0; k < cards.snapshotLength; k++) lista.push(avaliar(cards.snapshotItem(k)));
+return lista;
+"""
+
+
+def extrair_campos_js(driver, spec, tempos=None):
+    """Extrai todos os campos da página atual com um único execute_script.
+
+    Retorna (valores, origem): valor de cada campo (None se nenhum XPath encontrou)
+    e o índice do XPath usado (0 = principal, 1+ = fallback, None = não encontrado).
+    Se `tempos` for um dicionário, recebe os segundos gastos em cada campo.
+    """
+    resultado = driver.execute_script(SCRIPT_EXTRACAO, spec, None)
+    if tempos is not None:
+        tempos.update(resultado.get("tempos") or {})
+    return resultado["valores"], resultado["origem"]
+
+
+def extrair_cards_js(driver, xpath_cards, spec):
+    """Extrai os campos de todos os cards da página com um único execute_script."""
+    resultado = driver.execute_script(SCRIPT_EXTRACAO, spec, xpath_cards)
+    return [(card["valores"], card["origem"]) for card in resultado]
+
+
+def _avaliar_lxml(contexto, spec, tempos=None):
+    valores, origem = {}, {}
+    for nome, definicao in spec.items():
+        inicio = time.perf_counter()
+        valores[nome] = origem[nome] = None
+        for i, xpath in enumerate(definicao["xpaths"]):
+            elementos = contexto.xpath(xpath)
+            if not elementos:
+                continue
+            if definicao["atributo"]:
+                valores[nome] = elementos[0].get(definicao["atributo"])
+            else:
+                valores[nome] = texto_elemento(elementos[0])
+            origem[nome] = i
+            break
+        if tempos is not None:
+            tempos[nome] = time.perf_counter() - inicio
+    return valores, origem
+
+
+def extrair_campos_lxml(documento, spec, tempos=None):
+    """Mesma extração de extrair_campos_js(), sobre a árvore lxml de uma página baixada via HTTP."""
+    return _avaliar_lxml(documento, spec, tempos)
+
+
+def extrair_cards_lxml(documento, xpath_cards, spec):
+    return [_avaliar_lxml(card, spec) for card in documento.xpath(xpath_cards)]
+
+
+def relatar_campos(valores, origem, rotulos, perfil=None):
+    # Mesmo formato de log das extrações campo a campo (textos longos são resumidos).
+    # Com `perfil`, também conta campos não encontrados e fallbacks de seletor usados.
+    for nome, rotulo in rotulos.items():
+        if origem.get(nome) is None:
+            if perfil is not None:
+                perfil.contar("campo_nao_encontrado", campo=nome)
+            detalhe(f"  [ERRO] {rotulo}: elemento não encontrado")
+            continue
+        if origem[nome] > 0 and perfil is not None:
+            perfil.contar("fallback_seletor", campo=nome, fallback=origem[nome])
+        valor = valores[nome]
+        if valor and len(valor) > 80:
+            valor = valor[:77].replace("\n", " ") + "..."
+        via = f" (via fallback {origem[nome]})" if origem[nome] > 0 else ""
+        detalhe(f"  [OK] {rotulo}{via}: {valor}")
@@ -0,0 +1,57 @@
+# ============================================================
+# Checkpoint durável da coleta (retomada de execuções interrompidas)
+# ============================================================
+# Cada registro extraído é acrescentado a um arquivo JSON Lines e forçado para o
+# disco. Se o Chrome travar ou a rede cair no meio de uma execução "todas",
+# a próxima execução com retomar=True (--resume) recarrega o arquivo, pula os
+# links já concluídos e processa apenas o que faltava.
+
+import json
+import os
+import threading
+
+
+class Checkpoint:
+    def __init__(self, caminho, retomar=False):
+        self.caminho = caminho
+        self._concluidos = {}
+        self._lock = threading.Lock()
+        if retomar and os.path.exists(caminho):
+            self._carregar()
+        self._arquivo = open(caminho, "a" if retomar else "w", encoding="utf-8")
+        if retomar and self._arquivo.tell() > 0:
+            # Garante que uma linha truncada anterior não se junte à próxima gravação
+            with open(caminho, "rb") as arquivo:
+                arquivo.seek(-1, os.SEEK_END)
+                if arquivo.read(1) != b"\n":
+                    self._arquivo.write("\n")
+
+    def _carregar(self):
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    # Última linha incompleta (processo morto durante a escrita)
+                    continue
+                self._concluidos[registro["link"]] = registro
+        print(f"[INFO] Checkpoint {self.caminho}: {len(self._concluidos)} imóveis já concluídos.")
+
+    def __len__(self):
+        return len(self._concluidos)
+
+    def concluido(self, link):
+        """Registro salvo numa execução anterior para este link, ou None."""
+        return self._concluidos.get(link)
+
+    def gravar(self, registro):
+        linha = json.dumps(registro, ensure_ascii=False)
+        with self._lock:
+            self._arquivo.write(linha + "\n")
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self._concluidos[registro["link"]] = registro
+
+    def fechar(self):
+        with self._lock:
+            self._arquivo.close()
@@ -0,0 +1,319 @@
+# ============================================================
+# Linha de comando sem interação (cron, servidores sem interface gráfica)
+# ============================================================
+# Uso:
+#   python cli.py coletar --sites megaleiloes alfaleiloes --paginas todas \
+#       --formatos xlsx parquet --saida dados/ [--workers 8] [--incremental]
+#   python cli.py agendar --intervalo 60 --sites megaleiloes alfaleiloes --formatos parquet --saida dados/
+#
+# "coletar" faz uma execução e termina; "agendar" repete a coleta a cada
+# --intervalo minutos, sempre incremental (estado_coleta.py: lotes cujo card não
+# mudou não são abertos de novo), até receber SIGTERM ou Ctrl+C. Nesse caso os
+# lotes em andamento terminam, os arquivos da execução são gravados e o processo sai.
+#
+# Nada é perguntado ao usuário: sites, páginas, formatos, caminhos e concorrência
+# vêm dos argumentos, os arquivos são gravados em --saida com o nome de
+# --nome-arquivo ({site} e {data} são substituídos) e o Chrome roda headless.
+# Uma trava de arquivo (--trava) impede duas execuções ao mesmo tempo (ex.: o
+# cron disparando de novo antes de a anterior terminar): a segunda sai na hora.
+#
+# Código de saída: 0 se todos os sites foram coletados, 1 se algum falhou e
+# 75 (EX_TEMPFAIL) se outra execução estava em andamento.
+
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import motor
+from agendador import limitador_padrao
+from esquema import COLUNAS_LOTE, lotes_unificados
+from estado_coleta import CAMINHO_PADRAO as ESTADO_PADRAO, EstadoColeta
+from exportacao import FORMATOS, exportar_dataframe
+from normalizacao import normalizar_lotes
+from perfil import PerfilTempo, definir_silencioso
+from progresso import ProgressoColeta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+NOME_ARQUIVO_PADRAO = "{site}_{data}"
+TRAVA_PADRAO = "scraper.lock"
+CODIGO_EM_ANDAMENTO = 75  # EX_TEMPFAIL: o cron pode tentar de novo na próxima vez
+
+
+# ============================================================
+# Trava contra execuções sobrepostas
+# ============================================================
+
+class TravaExecucao:
+    """Trava exclusiva num arquivo, liberada pelo sistema mesmo se o processo morrer."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = None
+
+    def adquirir(self):
+        """True se a trava foi obtida; False se outra execução já a tem (não espera)."""
+        arquivo = open(self.caminho, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            arquivo.close()
+            return False
+        # PID de quem está rodando, só para diagnóstico
+        arquivo.truncate(0)
+        arquivo.write(f"{os.getpid()}\n")
+        arquivo.flush()
+        self._arquivo = arquivo
+        return True
+
+    def liberar(self):
+        if self._arquivo is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_UN)
+        else:
+            self._arquivo.seek(0)
+            msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+        self._arquivo.close()
+        self._arquivo = None
+
+
+# ============================================================
+# Exportação dos arquivos de uma execução
+# ============================================================
+
+def caminho_saida(args, site, instante, extensao):
+    nome = args.nome_arquivo.format(site=site, data=instante.strftime("%Y%m%d-%H%M%S"))
+    return os.path.join(args.saida, nome + extensao)
+
+
+def gravar_atomico(caminho, gravar):
+    # Quem lê a pasta de saída (outro job, um sync) nunca vê um arquivo pela metade
+    temporario = caminho + ".tmp"
+    gravar(temporario)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def exportar(adaptador, registros, args, instante, perfil):
+    """Grava os registros em cada formato pedido e devolve os caminhos gravados."""
+    arquivos = []
+    os.makedirs(args.saida, exist_ok=True)
+    if "xlsx" in args.formatos:
+        with perfil.medir("exportacao.xlsx"):
+            arquivos.append(gravar_atomico(
+                caminho_saida(args, adaptador.site, instante, ".xlsx"),
+                lambda caminho: motor.salvar_xlsx(adaptador, registros, caminho,
+                                                  campos_documentos=args.extrair_textos),
+            ))
+    if "csv" in args.formatos:
+        with perfil.medir("exportacao.csv"):
+            df = normalizar_lotes(pd.DataFrame(lotes_unificados(registros, adaptador.site), columns=COLUNAS_LOTE))
+            conteudo = exportar_dataframe(df, "csv")
+
+            def gravar_csv(caminho):
+                with open(caminho, "wb") as arquivo:
+                    arquivo.write(conteudo)
+
+            arquivos.append(gravar_atomico(caminho_saida(args, adaptador.site, instante, ".csv"), gravar_csv))
+    if "parquet" in args.formatos:
+        # Histórico particionado por site e data: cada execução acrescenta um arquivo
+        with perfil.medir("exportacao.parquet"):
+            arquivos.extend(motor.salvar_parquet(adaptador, registros, os.path.join(args.saida, "parquet")))
+    return arquivos
+
+
+# ============================================================
+# Execução
+# ============================================================
+
+class Execucao:
+    """Estado compartilhado entre as coletas do modo agendado e o tratamento de sinais."""
+
+    def __init__(self, args):
+        self.args = args
+        self.parar = threading.Event()
+        self.progressos = []
+        self.estados = {}  # site -> EstadoColeta, mantido aberto entre as execuções agendadas
+        self.adaptadores = motor.carregar_adaptadores()
+
+    def interromper(self, *_):
+        if not self.parar.is_set():
+            print("\n[AVISO] Interrupção pedida: terminando os lotes em andamento...")
+        self.parar.set()
+        for progresso in self.progressos:
+            progresso.cancelar()
+
+    def estado(self, site):
+        if not self.args.incremental:
+            return None
+        if site not in self.estados:
+            self.estados[site] = EstadoColeta(site, self.args.estado)
+        return self.estados[site]
+
+    def coletar_site(self, site, instante):
+        args = self.args
+        adaptador = self.adaptadores[site]
+        progresso = ProgressoColeta(site)
+        self.progressos.append(progresso)
+        perfil = PerfilTempo()
+        # Com data e hora: a saída costuma ir para o log do cron/systemd
+        motor.print_header(f"{datetime.now():%Y-%m-%d %H:%M:%S} - Coletando {adaptador.nome} (páginas: {args.paginas})")
+        registros = motor.raspar(adaptador, args.paginas, modo=args.modo, workers=args.workers, perfil=perfil,
+                                 estado=self.estado(site), somente_alteracoes=args.somente_alteracoes,
+                                 progresso=progresso)
+        if args.documentos:
+            motor.processar_documentos(registros, args.documentos, perfil, args.workers_documentos,
+                                       args.cota_documentos, args.extrair_textos, args.processos)
+        for arquivo in exportar(adaptador, registros, args, instante, perfil):
+            print(f"[SUCESSO] Arquivo gravado em: {arquivo}")
+        if args.indice:
+            from indice_busca import IndiceLotes  # Só quem usa a busca precisa do índice
+
+            indice = IndiceLotes(args.indice)
+            try:
+                alterados = indice.adicionar(lotes_unificados(registros, site))
+            finally:
+                indice.fechar()
+            print(f"[INFO] Índice de busca: {alterados} lotes novos ou alterados")
+        if args.metricas:
+            perfil.gravar_metricas(args.metricas.format(site=site), site=site)
+        print(f"[INFO] {adaptador.nome}: {len(registros)} imóveis em {time.perf_counter() - perfil.inicio:.0f} s")
+        return registros
+
+    def executar(self):
+        """Uma coleta de todos os sites; devolve o código de saída."""
+        trava = TravaExecucao(self.args.trava)
+        if not trava.adquirir():
+            print(f"[AVISO] Outra execução está em andamento (trava {self.args.trava}); nada foi feito.")
+            return CODIGO_EM_ANDAMENTO
+        codigo = 0
+        instante = datetime.now()
+        self.progressos = []
+        try:
+            for site in self.args.sites:
+                if self.parar.is_set():
+                    break
+                try:
+                    self.coletar_site(site, instante)
+                except Exception as e:
+                    codigo = 1
+                    print(f"[ERRO] Falha ao coletar {self.adaptadores[site].nome}: {type(e).__name__}: {e}")
+        finally:
+            # O Chrome não fica aberto entre as execuções agendadas
+            motor.obter_pool().encerrar()
+            trava.liberar()
+        return codigo
+
+    def agendar(self):
+        """Repete executar() a cada intervalo até ser interrompido (ou até --execucoes)."""
+        intervalo = self.args.intervalo * 60
+        execucoes, codigo = 0, 0
+        while not self.parar.is_set():
+            inicio = time.monotonic()
+            codigo = self.executar()
+            execucoes += 1
+            if self.args.execucoes and execucoes >= self.args.execucoes:
+                break
+            # Uma coleta mais longa que o intervalo não gera execuções atrasadas em sequência:
+            # a próxima fica para o próximo múltiplo do intervalo
+            decorrido = time.monotonic() - inicio
+            espera = intervalo - decorrido % intervalo
+            print(f"[INFO] Próxima coleta às {datetime.fromtimestamp(time.time() + espera):%Y-%m-%d %H:%M:%S}")
+            self.parar.wait(espera)
+        return codigo
+
+    def fechar(self):
+        for estado in self.estados.values():
+            estado.fechar()
+
+
+def criar_parser():
+    sites = sorted(motor.carregar_adaptadores())
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--sites", nargs="+", choices=sites, default=sites, help="sites a coletar (padrão: todos)")
+    comum.add_argument("--paginas", default="todas", help="número de páginas de cada site ou 'todas' (padrão)")
+    comum.add_argument("--formatos", nargs="+", choices=list(FORMATOS), default=["xlsx"],
+                       help="arquivos gravados a cada execução (parquet acrescenta ao histórico em SAIDA/parquet)")
+    comum.add_argument("--saida", default="dados", help="diretório dos arquivos gravados")
+    comum.add_argument("--nome-arquivo", default=NOME_ARQUIVO_PADRAO,
+                       help="nome dos arquivos sem extensão; {site} e {data} são substituídos")
+    comum.add_argument("--modo", choices=("http", "selenium"), default="http",
+                       help="como as páginas dos lotes são baixadas (padrão: http, sem navegador)")
+    comum.add_argument("--workers", type=int, default=4, help="lotes processados ao mesmo tempo por site")
+    comum.add_argument("--navegadores", type=int, help="máximo de Chrome abertos ao mesmo tempo")
+    comum.add_argument("--concorrencia-host", type=int,
+                       help="requisições simultâneas por domínio (padrão do agendador.py)")
+    comum.add_argument("--taxa-host", type=float, help="requisições por segundo por domínio")
+    comum.add_argument("--estado", default=ESTADO_PADRAO, help="banco do estado da coleta incremental")
+    comum.add_argument("--somente-alteracoes", action="store_true",
+                       help="grava só os lotes novos ou alterados desde a última coleta (implica --incremental)")
+    comum.add_argument("--documentos", metavar="DIRETORIO", help="baixa os documentos dos lotes para este diretório")
+    comum.add_argument("--workers-documentos", type=int, default=motor.WORKERS_DOCUMENTOS,
+                       help="downloads de documentos em paralelo")
+    comum.add_argument("--cota-documentos", type=float, metavar="MB", help="espaço máximo dos documentos em disco")
+    comum.add_argument("--extrair-textos", action="store_true",
+                       help="lê os PDFs baixados e acrescenta avaliação, área, matrícula e débitos")
+    comum.add_argument("--processos", type=int, help="processos usados na leitura dos PDFs")
+    comum.add_argument("--indice", metavar="ARQUIVO",
+                       help="também atualiza o índice de busca da interface (ex.: indice_lotes.db)")
+    comum.add_argument("--metricas", metavar="ARQUIVO",
+                       help="grava as métricas de cada site (JSON Lines ou .prom; {site} é substituído)")
+    comum.add_argument("--trava", default=TRAVA_PADRAO, help="arquivo usado como trava contra execuções sobrepostas")
+    comum.add_argument("--silencioso", action="store_true", help="imprime só os resumos de cada etapa")
+
+    parser = argparse.ArgumentParser(description="Coleta de leilões de imóveis sem interação com o usuário")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    coletar = comandos.add_parser("coletar", parents=[comum], help="uma coleta e termina")
+    coletar.add_argument("--incremental", action="store_true",
+                         help="reaproveita os lotes inalterados desde a última coleta e mostra o diff")
+    agendar = comandos.add_parser("agendar", parents=[comum], help="coletas incrementais periódicas")
+    agendar.add_argument("--intervalo", type=float, required=True, help="minutos entre o início das coletas")
+    agendar.add_argument("--execucoes", type=int, help="encerra depois deste número de coletas")
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.extrair_textos and not args.documentos:
+        parser.error("--extrair-textos requer --documentos")
+    try:
+        motor.parse_paginas(args.paginas)
+    except ValueError:
+        parser.error(f"--paginas deve ser um número ou 'todas', não {args.paginas!r}")
+    args.incremental = args.comando == "agendar" or args.incremental or args.somente_alteracoes
+    if args.silencioso:
+        definir_silencioso()
+    if args.navegadores:
+        motor.obter_pool().tamanho_max = args.navegadores
+    if args.concorrencia_host:
+        limitador_padrao.max_concorrencia = args.concorrencia_host
+    if args.taxa_host:
+        limitador_padrao.taxa = args.taxa_host
+
+    execucao = Execucao(args)
+    signal.signal(signal.SIGINT, execucao.interromper)
+    signal.signal(signal.SIGTERM, execucao.interromper)
+    try:
+        return execucao.agendar() if args.comando == "agendar" else execucao.executar()
+    finally:
+        execucao.fechar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
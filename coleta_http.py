@@ -0,0 +1,100 @@
+# ============================================================
+# Coleta via HTTP (sem navegador) para páginas renderizadas no servidor
+# ============================================================
+
+import os
+import re
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html
+
+from agendador import limitador_padrao  # Limites de concorrência/taxa por domínio
+from cache_http import CacheHTTP  # Cache em disco das páginas baixadas
+from retentativa import politica_padrao  # Novas tentativas com backoff e disjuntor por domínio
+
+HEADERS_PADRAO = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Language": "pt-BR,pt;q=0.9",
+}
+
+_sessao = None
+_sessao_lock = threading.Lock()
+
+# Cache HTTP ativo (None = desligado). Pode ser ligado pela variável SCRAPER_CACHE_HTTP
+# (caminho do arquivo/diretório do cache) ou por ativar_cache().
+_cache = CacheHTTP(os.environ["SCRAPER_CACHE_HTTP"]) if os.environ.get("SCRAPER_CACHE_HTTP") else None
+
+
+def ativar_cache(cache):
+    """Define o CacheHTTP usado por buscar_documento() (None desliga o cache)."""
+    global _cache
+    _cache = cache
+
+
+def obter_cache():
+    return _cache
+
+
+def obter_sessao(max_conexoes=10):
+    """Sessão HTTP compartilhada com conexões keep-alive reaproveitadas entre requisições."""
+    global _sessao
+    with _sessao_lock:
+        if _sessao is None:
+            sessao = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+            sessao.mount("http://", adapter)
+            sessao.mount("https://", adapter)
+            sessao.headers.update(HEADERS_PADRAO)
+            _sessao = sessao
+        return _sessao
+
+
+def buscar_documento(url, timeout=30, sessao=None, limitador=limitador_padrao, cache=None,
+                     retentativa=politica_padrao, ao_repetir=None):
+    """Baixa a página e devolve a árvore lxml com os links já convertidos em absolutos.
+
+    Com o cache ativo, páginas ainda válidas vêm do disco sem consumir o limite do domínio.
+    Falhas transitórias são repetidas conforme a política `retentativa` (None = uma
+    única tentativa); `ao_repetir(tentativa, erro)` é chamado antes de cada repetição.
+    """
+    sessao = sessao or obter_sessao()
+    cache = cache if cache is not None else _cache
+
+    def baixar(cabecalhos=None):
+        with limitador.slot(url):
+            return sessao.get(url, timeout=timeout, headers=cabecalhos)
+
+    def obter():
+        if cache is not None:
+            return cache.obter(url, baixar)
+        resposta = baixar()
+        resposta.raise_for_status()
+        return resposta.content, resposta.url
+
+    if retentativa is not None:
+        conteudo, url_final = retentativa.executar(url, obter, ao_repetir)
+    else:
+        conteudo, url_final = obter()
+    documento = html.fromstring(conteudo, base_url=url_final)
+    documento.make_links_absolute(url_final)
+    return documento
+
+
+def xpath_classe(nome, tag="*"):
+    """Equivalente em XPath ao By.CLASS_NAME do Selenium (classe exata, não substring)."""
+    return f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {nome} ")]'
+
+
+def texto_elemento(elemento):
+    # Aproxima o .text do Selenium: junta os nós de texto e normaliza espaços em cada linha
+    for br in elemento.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    linhas = "".join(elemento.itertext()).splitlines()
+    linhas = [re.sub(r"\s+", " ", linha).strip() for linha in linhas]
+    return "\n".join(linha for linha in linhas if linha)
+
@@ -0,0 +1,182 @@
+# ============================================================
+# Deduplicação de lotes entre sites (o mesmo imóvel na Mega e na Alfa)
+# ============================================================
+# Comparar todos os lotes entre si é quadrático. Em vez disso, só viram pares
+# candidatos os lotes que caem no mesmo "balde" de um destes índices:
+#   - número do processo CNJ normalizado (normalizacao.py);
+#   - LSH sobre a assinatura MinHash das sequências de 3 palavras da descrição.
+# Cada candidato é confirmado pela similaridade estimada da descrição (e do
+# título, quando falta descrição). Os grupos confirmados viram um único registro
+# com as fontes (site e link) de cada anúncio.
+
+import difflib
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from normalizacao import normalizar_processo
+
+NUM_PERMUTACOES = 64
+FAIXAS_LSH = 16  # 16 faixas x 4 linhas: pares com Jaccard >= ~0,5 quase sempre viram candidatos
+PRIMO = (1 << 31) - 1
+TAMANHO_SHINGLE = 3
+MAX_BALDE = 50  # Baldes maiores (textos genéricos repetidos) não geram candidatos
+
+LIMIAR_DESCRICAO = 0.7  # Sem processo em comum: descrições quase iguais
+LIMIAR_DESCRICAO_PROCESSO = 0.4  # Mesmo processo: basta descrição parecida
+LIMIAR_TITULO_PROCESSO = 0.6  # Mesmo processo sem descrição: título parecido
+
+CAMPOS_FONTE = ("site", "link")
+
+
+def _palavras(texto):
+    texto = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode("ascii").lower()
+    return re.findall(r"[a-z0-9]+", texto)
+
+
+def shingles(texto, tamanho=TAMANHO_SHINGLE):
+    """Hashes (31 bits) das sequências de `tamanho` palavras do texto."""
+    palavras = _palavras(texto)
+    if len(palavras) < tamanho:
+        grupos = [" ".join(palavras)] if palavras else []
+    else:
+        grupos = [" ".join(palavras[i:i + tamanho]) for i in range(len(palavras) - tamanho + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode()) & PRIMO for g in grupos), dtype=np.uint64,
+                                 count=len(grupos)))
+
+
+def assinaturas_minhash(textos, num_permutacoes=NUM_PERMUTACOES, semente=1, bloco=2000):
+    """Matriz (len(textos) x num_permutacoes) de assinaturas MinHash; linha de PRIMO = texto vazio."""
+    gerador = np.random.default_rng(semente)
+    a = gerador.integers(1, PRIMO, num_permutacoes, dtype=np.uint64)
+    b = gerador.integers(0, PRIMO, num_permutacoes, dtype=np.uint64)
+    conjuntos = [shingles(texto) for texto in textos]
+    assinaturas = np.full((len(conjuntos), num_permutacoes), PRIMO, dtype=np.uint64)
+    # Processa em blocos de textos para limitar a matriz (shingles x permutações) em memória
+    for inicio in range(0, len(conjuntos), bloco):
+        parte = conjuntos[inicio:inicio + bloco]
+        tamanhos = np.array([len(c) for c in parte])
+        if not tamanhos.sum():
+            continue
+        valores = (np.concatenate(parte)[:, None] * a + b) % PRIMO
+        cheios = np.flatnonzero(tamanhos)
+        posicoes = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))[cheios]
+        assinaturas[inicio + cheios] = np.minimum.reduceat(valores, posicoes, axis=0)
+    return assinaturas
+
+
+def _pares_do_balde(indices, pares):
+    if 1 < len(indices) <= MAX_BALDE:
+        for i, x in enumerate(indices):
+            for y in indices[i + 1:]:
+                pares.add((x, y) if x < y else (y, x))
+
+
+def candidatos_lsh(assinaturas, faixas=FAIXAS_LSH):
+    """Pares (i, j) cujas assinaturas coincidem inteiramente em ao menos uma faixa."""
+    pares = set()
+    vazias = (assinaturas == PRIMO).all(axis=1)
+    linhas = assinaturas.shape[1] // faixas
+    for f in range(faixas):
+        faixa = np.ascontiguousarray(assinaturas[:, f * linhas:(f + 1) * linhas])
+        chaves = faixa.view(np.dtype((np.void, faixa.dtype.itemsize * linhas))).ravel()
+        _, grupo = np.unique(chaves, return_inverse=True)
+        grupo = grupo.ravel()
+        grupo[vazias] = -1
+        ordem = np.argsort(grupo, kind="stable")
+        limites = np.flatnonzero(np.diff(grupo[ordem])) + 1
+        for balde in np.split(ordem, limites):
+            if grupo[balde[0]] >= 0:
+                _pares_do_balde(balde.tolist(), pares)
+    return pares
+
+
+def candidatos_processo(processos):
+    """Pares (i, j) com o mesmo número CNJ."""
+    pares = set()
+    baldes = pd.Series(range(len(processos))).groupby(pd.Series(processos).to_numpy(), dropna=True)
+    for _, indices in baldes:
+        _pares_do_balde(indices.tolist(), pares)
+    return pares
+
+
+class _Grupos:
+    # Union-find simples para juntar os pares confirmados em grupos
+    def __init__(self, n):
+        self.pai = list(range(n))
+
+    def raiz(self, x):
+        while self.pai[x] != x:
+            self.pai[x] = self.pai[self.pai[x]]
+            x = self.pai[x]
+        return x
+
+    def unir(self, x, y):
+        x, y = self.raiz(x), self.raiz(y)
+        if x != y:
+            self.pai[max(x, y)] = min(x, y)
+
+
+def _mesclar(registros):
+    # O primeiro anúncio é a base; campos vazios são completados pelos demais
+    mesclado = {"site": registros[0].get("site"), "link": registros[0].get("link")}
+    origem = {}
+    for registro in registros:
+        for chave, valor in registro.items():
+            if chave in CAMPOS_FONTE:
+                continue
+            vazio = (not isinstance(valor, (list, dict)) and pd.isna(valor)) or valor == ""
+            if chave not in origem or (origem[chave] is None and not vazio):
+                mesclado[chave] = valor
+                origem[chave] = None if vazio else registro.get("site")
+    mesclado["sites"] = sorted({r.get("site") for r in registros})
+    mesclado["fontes"] = [{"site": r.get("site"), "link": r.get("link")} for r in registros]
+    mesclado["origem_campos"] = {chave: site for chave, site in origem.items() if site is not None}
+    return mesclado
+
+
+def deduplicar_lotes(lotes, entre_sites=True):
+    """Agrupa anúncios do mesmo imóvel e devolve (registros mesclados, número de duplicatas removidas).
+
+    `lotes` é uma lista de dicionários ou um DataFrame no esquema unificado
+    (esquema.py). Com `entre_sites` só são unidos anúncios de sites diferentes:
+    dentro de um site, lotes do mesmo processo são imóveis distintos.
+    """
+    df = pd.DataFrame(lotes).reset_index(drop=True)
+    if df.empty:
+        return [], 0
+    if "numero_processo_cnj" not in df:
+        df["numero_processo_cnj"] = normalizar_processo(df["numero_processo"])
+    descricoes = df["descricao_lote"].fillna("").astype(str).tolist()
+    titulos = df["titulo_leilao"].fillna("").astype(str).tolist()
+    sites = df["site"].tolist()
+    processos = df["numero_processo_cnj"].astype(object).where(df["numero_processo_cnj"].notna(), None).tolist()
+
+    assinaturas = assinaturas_minhash(descricoes)
+    vazias = (assinaturas == PRIMO).all(axis=1)
+    candidatos = candidatos_lsh(assinaturas) | candidatos_processo(processos)
+
+    grupos = _Grupos(len(df))
+    for i, j in candidatos:
+        if entre_sites and sites[i] == sites[j]:
+            continue
+        mesmo_processo = processos[i] is not None and processos[i] == processos[j]
+        if vazias[i] or vazias[j]:
+            duplicado = mesmo_processo and difflib.SequenceMatcher(
+                None, titulos[i].lower(), titulos[j].lower()).ratio() >= LIMIAR_TITULO_PROCESSO
+        else:
+            similaridade = float(np.mean(assinaturas[i] == assinaturas[j]))
+            limiar = LIMIAR_DESCRICAO_PROCESSO if mesmo_processo else LIMIAR_DESCRICAO
+            duplicado = similaridade >= limiar
+        if duplicado:
+            grupos.unir(i, j)
+
+    membros = {}
+    for i in range(len(df)):
+        membros.setdefault(grupos.raiz(i), []).append(i)
+    registros = df.to_dict("records")
+    mesclados = [_mesclar([registros[i] for i in indices]) for indices in membros.values()]
+    return mesclados, len(df) - len(mesclados)
@@ -0,0 +1,318 @@
+# ============================================================
+# Download dos documentos dos lotes (editais, laudos, matrículas...)
+# ============================================================
+# Etapa opcional depois da coleta: baixa em paralelo os arquivos apontados por
+# `documentos` e `edital_leilao` de cada registro e os guarda pelo SHA-256 do
+# conteúdo (objetos/ab/abcdef....pdf). O mesmo edital compartilhado por vários
+# lotes, ou o mesmo arquivo publicado em URLs diferentes, fica uma única vez no disco.
+#
+# Cada download vai primeiro para parciais/; se a conexão cair, a nova tentativa
+# (retentativa.py) continua de onde parou com um pedido Range (If-Range garante que
+# o arquivo não mudou no servidor). Um manifesto SQLite liga cada documento ao seu
+# lote e ao arquivo, e as URLs já baixadas não são pedidas de novo em outra execução.
+# A concorrência fica limitada por `workers` e pelos limites do domínio
+# (agendador.py), e o total em disco por `cota_bytes`.
+
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from agendador import limitador_padrao  # Limites de concorrência/taxa por domínio
+from coleta_http import obter_sessao  # Sessão HTTP compartilhada (keep-alive)
+from retentativa import politica_padrao  # Novas tentativas com backoff e disjuntor por domínio
+
+WORKERS_PADRAO = 4
+TAMANHO_BLOCO = 256 * 1024  # bytes lidos da rede (e do disco, ao calcular o hash) por vez
+TIMEOUT = 60
+
+
+# Tipos que os sites usam para "qualquer arquivo": não dizem nada sobre o conteúdo
+TIPOS_GENERICOS = {"", "application/octet-stream", "binary/octet-stream", "application/download",
+                   "application/force-download", "application/x-download"}
+ASSINATURA_PDF = b"%PDF-"
+
+
+def e_pdf(caminho):
+    """Se o arquivo é um PDF, pela assinatura %PDF- (pode vir depois de lixo no primeiro KB)."""
+    with open(caminho, "rb") as arquivo:
+        return ASSINATURA_PDF in arquivo.read(1024)
+
+
+def extensao_arquivo(caminho, tipo, url):
+    """Extensão com que o arquivo baixado é guardado.
+
+    Ordem: assinatura de PDF no conteúdo, Content-Type (se não for genérico como
+    application/octet-stream), extensão da URL e, por fim, ".bin".
+    """
+    if e_pdf(caminho):
+        return ".pdf"
+    tipo = (tipo or "").split(";")[0].strip().lower()
+    if tipo not in TIPOS_GENERICOS:
+        extensao = mimetypes.guess_extension(tipo)
+        if extensao:
+            return extensao
+    return os.path.splitext(urlsplit(url).path)[1].lower() or ".bin"
+
+
+class CotaExcedida(Exception):
+    """O download passaria da cota de disco configurada."""
+
+
+def documentos_do_registro(registro):
+    """Pares (nome, url) dos documentos de um registro, sem repetir URLs."""
+    pares = list((registro.get("documentos") or {}).items())
+    if registro.get("edital_leilao"):
+        pares.append(("Edital", registro["edital_leilao"]))
+    vistos, resultado = set(), []
+    for nome, url in pares:
+        if not url or urlsplit(str(url)).scheme not in ("http", "https") or url in vistos:
+            continue
+        vistos.add(url)
+        resultado.append((nome, url))
+    return resultado
+
+
+def hash_arquivo(caminho, sha=None):
+    sha = sha or hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO), b""):
+            sha.update(bloco)
+    return sha
+
+
+class ColetorDocumentos:
+    """Baixa os documentos dos registros para `diretorio` e mantém o manifesto.
+
+    Uso: coletar(registros) depois de raspar(); manifesto() lista o que foi guardado.
+    """
+
+    def __init__(self, diretorio, workers=WORKERS_PADRAO, cota_bytes=None, sessao=None,
+                 limitador=limitador_padrao, retentativa=politica_padrao):
+        self.diretorio = diretorio
+        self.workers = workers
+        self.cota_bytes = cota_bytes
+        self.sessao = sessao or obter_sessao()
+        self.limitador = limitador
+        self.retentativa = retentativa
+        self._dir_objetos = os.path.join(diretorio, "objetos")
+        self._dir_parciais = os.path.join(diretorio, "parciais")
+        os.makedirs(self._dir_objetos, exist_ok=True)
+        os.makedirs(self._dir_parciais, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(os.path.join(diretorio, "manifesto.db"), check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS arquivos (
+                    sha256 TEXT PRIMARY KEY,
+                    caminho TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    tipo TEXT,
+                    baixado_em REAL NOT NULL
+                )"""
+            )
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL REFERENCES arquivos (sha256),
+                    baixado_em REAL NOT NULL
+                )"""
+            )
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS documentos (
+                    lote TEXT NOT NULL,
+                    nome TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    sha256 TEXT REFERENCES arquivos (sha256),
+                    erro TEXT,
+                    atualizado_em REAL NOT NULL,
+                    PRIMARY KEY (lote, nome)
+                )"""
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS documentos_sha256 ON documentos (sha256)")
+            # Bytes em disco: arquivos guardados + downloads interrompidos que ainda podem ser retomados
+            self._usado = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM arquivos").fetchone()[0]
+        self._usado += sum(entrada.stat().st_size for entrada in os.scandir(self._dir_parciais))
+        self.baixados = 0
+        self.reaproveitados = 0
+        self.duplicados = 0
+        self.falhas = 0
+
+    # ------------------------------------------------------------------
+    # Cota de disco
+    # ------------------------------------------------------------------
+
+    def _verificar_cota(self, tamanho):
+        if self.cota_bytes is not None and self._usado + tamanho > self.cota_bytes:
+            raise CotaExcedida(f"cota de {self.cota_bytes / 1024 / 1024:.0f} MB atingida")
+
+    def _reservar(self, tamanho):
+        with self._lock:
+            self._verificar_cota(tamanho)
+            self._usado += tamanho
+
+    def _liberar(self, tamanho):
+        with self._lock:
+            self._usado -= tamanho
+
+    # ------------------------------------------------------------------
+    # Download de uma URL
+    # ------------------------------------------------------------------
+
+    def _arquivo_da_url(self, url):
+        """SHA-256 do arquivo já baixado desta URL (se ele ainda existir no disco)."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT a.sha256, a.caminho FROM urls u JOIN arquivos a ON a.sha256 = u.sha256 WHERE u.url = ?",
+                (url,),
+            ).fetchone()
+        if linha is not None and os.path.exists(os.path.join(self.diretorio, linha[1])):
+            return linha[0]
+        return None
+
+    def _baixar_parcial(self, url, parcial):
+        # Uma tentativa: continua o arquivo parcial, se houver, a partir do último byte gravado
+        inicio = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+        cabecalhos = {}
+        if inicio:
+            cabecalhos["Range"] = f"bytes={inicio}-"
+            if os.path.exists(parcial + ".validador"):
+                with open(parcial + ".validador", encoding="utf-8") as arquivo:
+                    cabecalhos["If-Range"] = arquivo.read()
+        with self.limitador.slot(url):
+            with self.sessao.get(url, headers=cabecalhos, stream=True, timeout=TIMEOUT) as resposta:
+                if resposta.status_code == 416 and inicio:
+                    return resposta.headers.get("Content-Type")  # O parcial já estava completo
+                resposta.raise_for_status()
+                if inicio and resposta.status_code != 206:
+                    # O servidor ignorou o Range (ou o arquivo mudou): recomeça do zero
+                    self._liberar(inicio)
+                    inicio = 0
+                if resposta.headers.get("Content-Length"):
+                    # Tamanho conhecido: nem começa um download que não caberia na cota
+                    with self._lock:
+                        self._verificar_cota(int(resposta.headers["Content-Length"]))
+                validador = resposta.headers.get("ETag") or resposta.headers.get("Last-Modified")
+                if validador:
+                    with open(parcial + ".validador", "w", encoding="utf-8") as arquivo:
+                        arquivo.write(validador)
+                with open(parcial, "ab" if inicio else "wb") as arquivo:
+                    for bloco in resposta.iter_content(TAMANHO_BLOCO):
+                        self._reservar(len(bloco))
+                        arquivo.write(bloco)
+                return resposta.headers.get("Content-Type")
+
+    def baixar(self, url):
+        """Baixa a URL (se ainda não estiver guardada) e devolve o SHA-256 do conteúdo."""
+        sha256 = self._arquivo_da_url(url)
+        if sha256 is not None:
+            with self._lock:
+                self.reaproveitados += 1
+            return sha256
+
+        parcial = os.path.join(self._dir_parciais, hashlib.sha1(url.encode("utf-8")).hexdigest())
+        try:
+            tipo = self.retentativa.executar(url, lambda: self._baixar_parcial(url, parcial))
+        except CotaExcedida:
+            # Sem espaço: o parcial não será retomado
+            if os.path.exists(parcial):
+                self._liberar(os.path.getsize(parcial))
+                os.remove(parcial)
+            raise
+
+        sha256 = hash_arquivo(parcial).hexdigest()
+        tamanho = os.path.getsize(parcial)
+        relativo = os.path.join("objetos", sha256[:2], sha256 + extensao_arquivo(parcial, tipo, url))
+        with self._lock:
+            existente = self._conexao.execute("SELECT caminho FROM arquivos WHERE sha256 = ?", (sha256,)).fetchone()
+        if existente is not None and os.path.exists(os.path.join(self.diretorio, existente[0])):
+            # Mesmo conteúdo já guardado a partir de outra URL
+            os.remove(parcial)
+            self._liberar(tamanho)
+            with self._lock:
+                self.duplicados += 1
+        else:
+            os.makedirs(os.path.join(self._dir_objetos, sha256[:2]), exist_ok=True)
+            os.replace(parcial, os.path.join(self.diretorio, relativo))
+            with self._lock, self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO arquivos (sha256, caminho, tamanho, tipo, baixado_em) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (sha256, relativo, tamanho, tipo, time.time()),
+                )
+                self.baixados += 1
+        if os.path.exists(parcial + ".validador"):
+            os.remove(parcial + ".validador")
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256, baixado_em) VALUES (?, ?, ?)",
+                (url, sha256, time.time()),
+            )
+        return sha256
+
+    # ------------------------------------------------------------------
+    # Lotes
+    # ------------------------------------------------------------------
+
+    def coletar(self, registros):
+        """Baixa os documentos de todos os registros e grava no manifesto de qual lote cada um é."""
+        documentos = [(registro["link"], nome, url)
+                      for registro in registros for nome, url in documentos_do_registro(registro)]
+        urls = list(dict.fromkeys(url for _, _, url in documentos))  # Cada URL é baixada uma única vez
+        resultados = {}
+
+        def baixar(url):
+            try:
+                resultados[url] = (self.baixar(url), None)
+            except Exception as e:
+                with self._lock:
+                    self.falhas += 1
+                resultados[url] = (None, f"{type(e).__name__}: {e}")
+                print(f"  [ERRO] Documento {url}: {e}")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="documentos") as executor:
+            list(executor.map(baixar, urls))
+
+        agora = time.time()
+        with self._lock, self._conexao:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO documentos (lote, nome, url, sha256, erro, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(lote, nome, url, *resultados[url], agora) for lote, nome, url in documentos],
+            )
+        return {"documentos": len(documentos), "urls": len(urls), "baixados": self.baixados,
+                "reaproveitados": self.reaproveitados, "duplicados": self.duplicados, "falhas": self.falhas,
+                "bytes_em_disco": self._usado}
+
+    def manifesto(self, lote=None):
+        """Documentos guardados (um dicionário por documento de lote), opcionalmente de um único lote."""
+        consulta = ("SELECT d.lote, d.nome, d.url, d.sha256, a.caminho, a.tamanho, a.tipo, d.erro "
+                    "FROM documentos d LEFT JOIN arquivos a ON a.sha256 = d.sha256")
+        parametros = ()
+        if lote is not None:
+            consulta += " WHERE d.lote = ?"
+            parametros = (lote,)
+        with self._lock:
+            linhas = self._conexao.execute(consulta + " ORDER BY d.lote, d.nome", parametros).fetchall()
+        colunas = ("lote", "nome", "url", "sha256", "caminho", "tamanho", "tipo", "erro")
+        return [dict(zip(colunas, linha)) for linha in linhas]
+
+    def caminho(self, sha256):
+        """Caminho absoluto do arquivo guardado com este SHA-256 (None se não existir)."""
+        with self._lock:
+            linha = self._conexao.execute("SELECT caminho FROM arquivos WHERE sha256 = ?", (sha256,)).fetchone()
+        return os.path.join(self.diretorio, linha[0]) if linha else None
+
+    def relatorio(self):
+        return (f"Documentos: {self.baixados} baixados, {self.reaproveitados} já guardados, "
+                f"{self.duplicados} com conteúdo repetido, {self.falhas} falhas "
+                f"({self._usado / 1024 / 1024:.1f} MB em disco)")
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
@@ -0,0 +1,93 @@
+# ============================================================
+# Esquema unificado dos lotes (comum a todos os sites)
+# ============================================================
+# Cada scraper devolve seu próprio dicionário, com nomes de documentos
+# diferentes ("Matricula" na Mega, "Certidão de Matrícula" na Alfa...).
+# lote_unificado() converte esse registro para um formato único e tipado, usado
+# na exportação colunar (Parquet) e na junção dos sites na interface.
+
+from datetime import datetime, timezone
+
+# Documentos conhecidos -> coluna do esquema unificado. O "Edital" já vem em
+# edital_leilao; documentos fora desta lista vão para outros_documentos.
+COLUNAS_DOCUMENTOS = {
+    "Matricula": "doc_matricula",
+    "Certidão de Matrícula": "doc_matricula",
+    "Laudo de Avaliação": "doc_laudo_avaliacao",
+    "Débitos Tributários": "doc_debitos_tributarios",
+    "Débito Exequendo/Condominial": "doc_debito_exequendo",
+    "Manual de Participação": "doc_manual_participacao",
+}
+
+# (coluna, tipo) na ordem em que aparecem nos arquivos exportados
+CAMPOS_LOTE = [
+    ("site", "texto"),
+    ("link", "texto"),
+    ("titulo_leilao", "texto"),
+    ("tipo_leilao", "texto"),
+    ("numero_processo", "texto"),
+    ("numero_processo_cnj", "texto"),
+    ("valor_imovel", "texto"),
+    ("valor", "numero"),  # valor_imovel normalizado (normalizacao.py)
+    ("valor_avaliacao", "numero"),  # Campos tirados dos PDFs (textos_documentos.py)
+    ("area_m2", "numero"),
+    ("numero_matricula", "texto"),
+    ("debitos", "numero"),
+    ("descricao_lote", "texto"),
+    ("status", "texto"),
+    ("status_lote", "texto"),
+    ("edital_leilao", "texto"),
+    ("doc_matricula", "texto"),
+    ("doc_laudo_avaliacao", "texto"),
+    ("doc_debitos_tributarios", "texto"),
+    ("doc_debito_exequendo", "texto"),
+    ("doc_manual_participacao", "texto"),
+    ("outros_documentos", "documentos"),
+    ("coletado_em", "instante"),
+    ("data_coleta", "data"),
+]
+COLUNAS_LOTE = [nome for nome, _ in CAMPOS_LOTE]
+
+
+def esquema_arrow(excluir=()):
+    """Esquema pyarrow dos lotes (sem as colunas em `excluir`, ex.: as de partição)."""
+    import pyarrow as pa
+
+    tipos = {
+        "texto": pa.string(),
+        "numero": pa.float64(),
+        "documentos": pa.map_(pa.string(), pa.string()),
+        "instante": pa.timestamp("us", tz="UTC"),
+        "data": pa.date32(),
+    }
+    return pa.schema([(nome, tipos[tipo]) for nome, tipo in CAMPOS_LOTE if nome not in excluir])
+
+
+def lote_unificado(registro, site, coletado_em=None):
+    """Converte um registro de megaleiloes/alfaleiloes para o esquema unificado."""
+    coletado_em = coletado_em or datetime.now(timezone.utc)
+    lote = {nome: None for nome in COLUNAS_LOTE}
+    for chave in ("link", "titulo_leilao", "tipo_leilao", "numero_processo", "valor_imovel",
+                  "descricao_lote", "status", "edital_leilao",
+                  "valor_avaliacao", "area_m2", "numero_matricula", "debitos"):
+        lote[chave] = registro.get(chave)
+    outros = []
+    for nome, href in (registro.get("documentos") or {}).items():
+        if nome == "Edital":
+            lote["edital_leilao"] = lote["edital_leilao"] or href
+        elif nome in COLUNAS_DOCUMENTOS:
+            lote[COLUNAS_DOCUMENTOS[nome]] = href
+        else:
+            outros.append((nome, href))
+    lote["outros_documentos"] = outros
+    lote["site"] = site
+    lote["coletado_em"] = coletado_em
+    lote["data_coleta"] = coletado_em.date()
+    return lote
+
+
+def lotes_unificados(registros, site, coletado_em=None):
+    # Gerador: todos os lotes de uma mesma execução recebem o mesmo instante de coleta
+    coletado_em = coletado_em or datetime.now(timezone.utc)
+    for registro in registros:
+        yield lote_unificado(registro, site, coletado_em)
@@ -0,0 +1,131 @@
+# ============================================================
+# Estado persistente da coleta (re-execuções incrementais)
+# ============================================================
+# Guarda, por link de lote, o último registro extraído, o hash do conteúdo,
+# o status e a assinatura do card da listagem. Numa nova execução, lotes cujo
+# card não mudou reaproveitam o registro salvo sem abrir a página de detalhe.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CAMINHO_PADRAO = os.environ.get("SCRAPER_ESTADO", "estado_coleta.db")
+
+
+def assinatura_card(texto):
+    """Hash do texto visível do card (status, valor, datas...); muda quando o card muda."""
+    return hashlib.sha1((texto or "").strip().encode("utf-8")).hexdigest()
+
+
+def hash_registro(registro):
+    return hashlib.sha256(json.dumps(registro, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class EstadoColeta:
+    """Armazena o estado de um site em SQLite e calcula o diff de cada execução.
+
+    Uso: registro_inalterado() antes de abrir o lote, salvar() depois de extraí-lo
+    e finalizar() ao fim da execução para obter novos, alterados e desaparecidos.
+    """
+
+    def __init__(self, site, caminho=CAMINHO_PADRAO):
+        self.site = site
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._inicio = time.time()
+        self._novos, self._alterados, self._inalterados = [], [], []
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS lotes (
+                    link TEXT PRIMARY KEY,
+                    site TEXT NOT NULL,
+                    registro TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    status TEXT,
+                    assinatura TEXT,
+                    visto_em REAL NOT NULL,
+                    ativo INTEGER NOT NULL DEFAULT 1
+                )"""
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS lotes_site ON lotes (site, ativo)")
+
+    def registro_inalterado(self, link, status, assinatura):
+        """Registro salvo se status e assinatura do card forem os mesmos da última coleta; senão None."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT registro, status, assinatura FROM lotes WHERE link = ? AND ativo = 1", (link,)
+            ).fetchone()
+            if linha is None or linha[1] != status or linha[2] != assinatura:
+                return None
+            with self._conexao:
+                self._conexao.execute("UPDATE lotes SET visto_em = ? WHERE link = ?", (time.time(), link))
+            self._inalterados.append(link)
+        return json.loads(linha[0])
+
+    def marcar_visto(self, link):
+        """Lote presente na listagem mas não processado (ex.: erro): não conta como desaparecido."""
+        with self._lock, self._conexao:
+            self._conexao.execute("UPDATE lotes SET visto_em = ? WHERE link = ?", (time.time(), link))
+
+    def salvar(self, link, registro, status, assinatura):
+        """Grava o registro extraído e o classifica como novo, alterado ou inalterado."""
+        novo_hash = hash_registro(registro)
+        with self._lock:
+            linha = self._conexao.execute("SELECT hash, ativo FROM lotes WHERE link = ?", (link,)).fetchone()
+            with self._conexao:
+                self._conexao.execute(
+                    """INSERT INTO lotes (link, site, registro, hash, status, assinatura, visto_em, ativo)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                       ON CONFLICT(link) DO UPDATE SET
+                           registro = excluded.registro, hash = excluded.hash, status = excluded.status,
+                           assinatura = excluded.assinatura, visto_em = excluded.visto_em, ativo = 1""",
+                    (link, self.site, json.dumps(registro, ensure_ascii=False), novo_hash,
+                     status, assinatura, time.time()),
+                )
+            if linha is None or not linha[1]:
+                self._novos.append(link)
+                return "novo"
+            if linha[0] != novo_hash:
+                self._alterados.append(link)
+                return "alterado"
+            self._inalterados.append(link)
+            return "inalterado"
+
+    def finalizar(self, completa=True):
+        """Encerra a execução e devolve o diff.
+
+        Lotes ativos que não apareceram na listagem são marcados como desaparecidos,
+        mas só quando a execução percorreu todas as páginas (`completa`).
+        """
+        with self._lock:
+            desaparecidos = []
+            if completa:
+                desaparecidos = [
+                    linha[0] for linha in self._conexao.execute(
+                        "SELECT link FROM lotes WHERE site = ? AND ativo = 1 AND visto_em < ?",
+                        (self.site, self._inicio),
+                    )
+                ]
+                with self._conexao:
+                    self._conexao.executemany(
+                        "UPDATE lotes SET ativo = 0 WHERE link = ?", [(link,) for link in desaparecidos]
+                    )
+            diff = {
+                "novos": self._novos,
+                "alterados": self._alterados,
+                "desaparecidos": desaparecidos,
+                "inalterados": len(self._inalterados),
+            }
+            # Prepara a instância para a próxima execução
+            self._novos, self._alterados, self._inalterados = [], [], []
+            self._inicio = time.time()
+            return diff
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
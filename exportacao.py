@@ -0,0 +1,191 @@
+# ============================================================
+# Exportação em streaming: Excel (XLSX) e Parquet
+# ============================================================
+# XLSX: usa o modo write-only do openpyxl: cada linha é gravada assim que chega do
+# gerador e não fica em memória. Os estilos são criados uma única vez (estilos
+# nomeados da planilha) e reaproveitados em todas as células.
+#
+# Parquet: lotes no esquema unificado (esquema.py), particionados por site e data
+# da coleta (site=.../data_coleta=AAAA-MM-DD/), gravados em row groups de tamanho
+# fixo. O histórico pode ser consultado com pyarrow.dataset / DuckDB / pandas,
+# lendo apenas as partições e colunas necessárias.
+
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime, timezone
+from itertools import chain, islice
+
+import pandas as pd
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from esquema import esquema_arrow
+from normalizacao import normalizar_lotes
+
+LARGURA_MAXIMA = 80
+# No modo write-only a largura das colunas precisa ser definida antes da primeira
+# linha; ela é calculada sobre as primeiras linhas (o limite de 80 é atingido cedo).
+AMOSTRA_LARGURA = 1000
+
+
+def _criar_estilos(wb):
+    borda = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    alinhamento = Alignment(wrap_text=True, vertical="top")
+    estilos = {
+        "cabecalho": NamedStyle(name="cabecalho", font=Font(bold=True, color="FFFFFF"),
+                                fill=PatternFill("solid", fgColor="4F81BD"),
+                                border=borda, alignment=alinhamento),
+        "celula": NamedStyle(name="celula", font=Font(color="000000"), border=borda, alignment=alinhamento),
+        "link": NamedStyle(name="link", font=Font(color="0000FF", underline="single"),
+                           border=borda, alignment=alinhamento),
+    }
+    for estilo in estilos.values():
+        wb.add_named_style(estilo)
+    return estilos
+
+
+def escrever_xlsx(linhas, caminho_arquivo, colunas, colunas_link=(), titulo="Leilões"):
+    """Grava as linhas (iterável de dicionários coluna -> valor) numa planilha estilizada.
+
+    Retorna o número de linhas de dados escritas. A memória usada não depende do
+    total de linhas: basta passar um gerador.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(titulo)
+    _criar_estilos(wb)
+    colunas_link = set(colunas_link)
+
+    # Largura de cada coluna a partir do cabeçalho e de uma amostra inicial das linhas
+    linhas = iter(linhas)
+    amostra = list(islice(linhas, AMOSTRA_LARGURA))
+    larguras = [len(str(coluna)) for coluna in colunas]
+    for linha in amostra:
+        for c_idx, coluna in enumerate(colunas):
+            valor = linha.get(coluna)
+            if valor:
+                larguras[c_idx] = max(larguras[c_idx], len(str(valor)))
+    for c_idx, largura in enumerate(larguras, 1):
+        ws.column_dimensions[get_column_letter(c_idx)].width = min(largura + 5, LARGURA_MAXIMA)
+
+    cabecalho = []
+    for coluna in colunas:
+        cell = WriteOnlyCell(ws, value=coluna)
+        cell.style = "cabecalho"
+        cabecalho.append(cell)
+    ws.append(cabecalho)
+
+    total = 0
+    for linha in chain(amostra, linhas):
+        celulas = []
+        for coluna in colunas:
+            valor = linha.get(coluna)
+            cell = WriteOnlyCell(ws, value=valor)
+            if coluna in colunas_link and str(valor).strip().lower().startswith("http"):
+                cell.hyperlink = valor
+                cell.style = "link"
+            else:
+                cell.style = "celula"
+                if isinstance(valor, datetime):
+                    cell.number_format = "yyyy-mm-dd hh:mm:ss"
+                elif isinstance(valor, date):
+                    cell.number_format = "yyyy-mm-dd"
+            celulas.append(cell)
+        ws.append(celulas)
+        total += 1
+
+    wb.save(caminho_arquivo)
+    return total
+
+
+COLUNAS_PARTICAO = ("site", "data_coleta")
+LINHAS_POR_GRUPO = 10000
+
+
+def escrever_parquet(lotes, diretorio, linhas_por_grupo=LINHAS_POR_GRUPO):
+    """Grava os lotes (iterável no esquema unificado) em Parquet particionado por site e data.
+
+    Cada execução cria um arquivo novo em cada partição, sem sobrescrever as
+    anteriores. No máximo `linhas_por_grupo` linhas por partição ficam em memória
+    antes de virarem um row group. Retorna a lista de arquivos gravados.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = esquema_arrow(excluir=COLUNAS_PARTICAO)
+    nome_arquivo = f"lotes-{uuid.uuid4().hex}.parquet"
+    escritores, pendentes, arquivos = {}, {}, []
+
+    def descarregar(particao):
+        linhas = pendentes.pop(particao)
+        if particao not in escritores:
+            site, data_coleta = particao
+            pasta = os.path.join(diretorio, f"site={site}", f"data_coleta={data_coleta.isoformat()}")
+            os.makedirs(pasta, exist_ok=True)
+            arquivos.append(os.path.join(pasta, nome_arquivo))
+            escritores[particao] = pq.ParquetWriter(arquivos[-1], esquema, compression="zstd")
+        # Valor, processo e status são normalizados no lote inteiro, de forma vetorizada
+        df = normalizar_lotes(pd.DataFrame(linhas))
+        df["status_lote"] = df["status_lote"].astype("string")
+        tabela = pa.Table.from_pandas(df[esquema.names], schema=esquema, preserve_index=False)
+        escritores[particao].write_table(tabela, row_group_size=linhas_por_grupo)
+
+    try:
+        for lote in lotes:
+            particao = (lote["site"], lote["data_coleta"])
+            pendentes.setdefault(particao, []).append(lote)
+            if len(pendentes[particao]) >= linhas_por_grupo:
+                descarregar(particao)
+        for particao in list(pendentes):
+            descarregar(particao)
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+    return arquivos
+
+
+FORMATOS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _celula(valor):
+    # Listas e dicionários (documentos, fontes) viram JSON na planilha ou no CSV
+    if isinstance(valor, (list, tuple, dict)):
+        return json.dumps(valor, ensure_ascii=False, default=str)
+    if isinstance(valor, datetime) and valor.tzinfo is not None:
+        # O Excel não guarda fuso horário: instantes vão em UTC
+        return valor.astimezone(timezone.utc).replace(tzinfo=None)
+    return valor
+
+
+def exportar_dataframe(df, formato):
+    """Conteúdo (bytes) do DataFrame no formato pedido, gerado em memória, sem arquivo em disco."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido: {formato!r} (use {', '.join(FORMATOS)})")
+    buffer = io.BytesIO()
+    if formato == "parquet":
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    planilha = df.astype(object).where(df.notna(), None)
+    for coluna in planilha.columns:
+        planilha[coluna] = planilha[coluna].map(_celula)
+    if formato == "csv":
+        # BOM para o Excel reconhecer os acentos
+        return planilha.to_csv(index=False).encode("utf-8-sig")
+    colunas = [str(coluna) for coluna in planilha.columns]
+    colunas_link = [c for c in colunas if c == "link" or c.startswith(("doc_", "edital"))]
+    escrever_xlsx((dict(zip(colunas, linha)) for linha in planilha.itertuples(index=False)),
+                  buffer, colunas, colunas_link)
+    return buffer.getvalue()
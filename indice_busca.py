@@ -0,0 +1,204 @@
+# ============================================================
+# Índice de busca textual dos lotes (SQLite FTS5)
+# ============================================================
+# Os lotes coletados (no esquema unificado, esquema.py) são gravados numa tabela
+# SQLite em disco e indexados por título e descrição num índice invertido FTS5:
+#   - sem acentos ("desocupacao" encontra "desocupação") e sem diferenciar maiúsculas;
+#   - resultados ordenados por relevância (BM25, título pesa mais que a descrição);
+#   - filtros por faixa de valor, status (normalizacao.StatusLote) e site, com índices
+#     comuns na tabela, para responder em milissegundos com centenas de milhares de lotes.
+# adicionar() pode ser chamado a cada lote pronto: cada link é um único registro,
+# atualizado (e reindexado) só quando algum campo além do instante da coleta muda.
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from esquema import COLUNAS_LOTE
+from normalizacao import normalizar_lotes
+
+LIMITE_RESULTADOS = 500
+LIMITE_RANKING = 5000  # Buscas com mais resultados que isso não são ordenadas por relevância (ver buscar())
+PESO_TITULO = 2.0  # Peso do título em relação à descrição no BM25
+CAMPOS_ASSINATURA = [coluna for coluna in COLUNAS_LOTE if coluna not in ("coletado_em", "data_coleta")]
+
+
+def consulta_fts(texto):
+    """Converte o texto digitado numa consulta FTS5: todas as palavras, a última também como prefixo
+    (a busca já responde enquanto a palavra é digitada).
+
+    Aspas, operadores e pontuação do usuário não chegam ao FTS5 (não geram erro de sintaxe).
+    """
+    palavras = [f'"{palavra}"' for palavra in re.findall(r"\w+", texto)]
+    if palavras:
+        palavras[-1] += "*"
+    return " ".join(palavras)
+
+
+def _valor_json(valor):
+    if isinstance(valor, (list, tuple)):
+        return valor
+    return None if pd.isna(valor) else valor
+
+
+class IndiceLotes:
+    """Tabela de lotes + índice FTS5 num arquivo SQLite, compartilhável entre threads."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS lotes (
+                    id INTEGER PRIMARY KEY,
+                    link TEXT NOT NULL UNIQUE,
+                    site TEXT,
+                    titulo_leilao TEXT,
+                    descricao_lote TEXT,
+                    valor REAL,
+                    status_lote TEXT,
+                    dados TEXT NOT NULL,
+                    assinatura TEXT NOT NULL,
+                    atualizado_em REAL NOT NULL
+                )"""
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS lotes_valor ON lotes (valor)")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS lotes_atualizado ON lotes (atualizado_em)")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS lotes_status_valor ON lotes (status_lote, valor)")
+            # Índice "external content": o texto fica só na tabela lotes, o FTS5 guarda os termos
+            self._conexao.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS lotes_fts USING fts5 (
+                    titulo_leilao, descricao_lote,
+                    content='lotes', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )"""
+            )
+            # Gatilhos mantêm o índice igual à tabela em inserções, atualizações e remoções
+            self._conexao.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS lotes_inserido AFTER INSERT ON lotes BEGIN
+                    INSERT INTO lotes_fts (rowid, titulo_leilao, descricao_lote)
+                    VALUES (new.id, new.titulo_leilao, new.descricao_lote);
+                END;
+                CREATE TRIGGER IF NOT EXISTS lotes_removido AFTER DELETE ON lotes BEGIN
+                    INSERT INTO lotes_fts (lotes_fts, rowid, titulo_leilao, descricao_lote)
+                    VALUES ('delete', old.id, old.titulo_leilao, old.descricao_lote);
+                END;
+                CREATE TRIGGER IF NOT EXISTS lotes_atualizado AFTER UPDATE OF titulo_leilao, descricao_lote ON lotes
+                BEGIN
+                    INSERT INTO lotes_fts (lotes_fts, rowid, titulo_leilao, descricao_lote)
+                    VALUES ('delete', old.id, old.titulo_leilao, old.descricao_lote);
+                    INSERT INTO lotes_fts (rowid, titulo_leilao, descricao_lote)
+                    VALUES (new.id, new.titulo_leilao, new.descricao_lote);
+                END;
+                """
+            )
+
+    def adicionar(self, lotes):
+        """Grava (ou atualiza) os lotes no esquema unificado; retorna quantos foram inseridos ou alterados."""
+        lotes = list(lotes)
+        if not lotes:
+            return 0
+        df = normalizar_lotes(pd.DataFrame(lotes, columns=COLUNAS_LOTE))
+        agora = time.time()
+        linhas = []
+        for lote in df.to_dict("records"):
+            lote = {coluna: _valor_json(valor) for coluna, valor in lote.items()}
+            if not lote["link"]:
+                continue
+            dados = json.dumps(lote, ensure_ascii=False, default=str)
+            assinatura = hashlib.sha1(json.dumps([lote[c] for c in CAMPOS_ASSINATURA], ensure_ascii=False,
+                                                 default=str).encode("utf-8")).hexdigest()
+            linhas.append((lote["link"], lote["site"], lote["titulo_leilao"], lote["descricao_lote"],
+                           lote["valor"], lote["status_lote"], dados, assinatura, agora))
+        with self._lock, self._conexao:
+            cursor = self._conexao.executemany(
+                """INSERT INTO lotes (link, site, titulo_leilao, descricao_lote, valor, status_lote,
+                                      dados, assinatura, atualizado_em)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (link) DO UPDATE SET
+                       site = excluded.site, titulo_leilao = excluded.titulo_leilao,
+                       descricao_lote = excluded.descricao_lote, valor = excluded.valor,
+                       status_lote = excluded.status_lote, dados = excluded.dados,
+                       assinatura = excluded.assinatura, atualizado_em = excluded.atualizado_em
+                   WHERE lotes.assinatura != excluded.assinatura""",
+                linhas,
+            )
+            return cursor.rowcount
+
+    def _filtros(self, valor_min, valor_max, status, sites):
+        condicoes, parametros = [], []
+        if valor_min is not None:
+            condicoes.append("lotes.valor >= ?")
+            parametros.append(valor_min)
+        if valor_max is not None:
+            condicoes.append("lotes.valor <= ?")
+            parametros.append(valor_max)
+        if status:
+            condicoes.append(f"lotes.status_lote IN ({','.join('?' * len(status))})")
+            parametros.extend(status)
+        if sites:
+            condicoes.append(f"lotes.site IN ({','.join('?' * len(sites))})")
+            parametros.extend(sites)
+        return condicoes, parametros
+
+    def buscar(self, texto="", valor_min=None, valor_max=None, status=(), sites=(), limite=LIMITE_RESULTADOS):
+        """Lotes que contêm todas as palavras de `texto` e passam nos filtros, do mais ao menos relevante.
+
+        Retorna (DataFrame com as colunas de COLUNAS_LOTE, total de lotes encontrados). Sem
+        texto, os lotes atualizados mais recentemente vêm primeiro. Numa busca com mais de
+        LIMITE_RANKING resultados o total para em LIMITE_RANKING + 1 e, como sem texto, vêm
+        primeiro os atualizados mais recentemente (ordenar tudo por relevância custaria centenas de ms).
+        """
+        condicoes, parametros = self._filtros(valor_min, valor_max, status, sites)
+        consulta = consulta_fts(texto)
+        if not consulta:
+            onde = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+            with self._lock:
+                total = self._conexao.execute(f"SELECT COUNT(*) FROM lotes{onde}", parametros).fetchone()[0]
+                linhas = self._conexao.execute(
+                    f"SELECT dados FROM lotes{onde} ORDER BY atualizado_em DESC, id DESC LIMIT ?",
+                    [*parametros, limite],
+                ).fetchall()
+            return pd.DataFrame([json.loads(dados) for dados, in linhas], columns=COLUNAS_LOTE), total
+
+        # CROSS JOIN fixa o índice FTS5 como laço externo (o SQLite poderia percorrer a tabela
+        # pelo índice de status e consultar o FTS5 uma vez por linha)
+        origem = "lotes_fts CROSS JOIN lotes ON lotes.id = lotes_fts.rowid"
+        onde = " WHERE " + " AND ".join(["lotes_fts MATCH ?", *condicoes])
+        parametros = [consulta, *parametros]
+        with self._lock:
+            total = self._conexao.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {origem}{onde} LIMIT ?)", [*parametros, LIMITE_RANKING + 1]
+            ).fetchone()[0]
+            if total <= LIMITE_RANKING:
+                linhas = self._conexao.execute(
+                    f"SELECT lotes.dados FROM {origem}{onde} ORDER BY bm25(lotes_fts, {PESO_TITULO}, 1.0) LIMIT ?",
+                    [*parametros, limite],
+                ).fetchall()
+            else:
+                # Muitos resultados (ao menos LIMITE_RANKING): percorre a tabela pelo índice de
+                # atualizado_em e para no limite, em vez de ordenar todos os lotes encontrados
+                onde = " WHERE " + " AND ".join(
+                    ["lotes.id IN (SELECT rowid FROM lotes_fts WHERE lotes_fts MATCH ?)", *condicoes])
+                linhas = self._conexao.execute(
+                    f"SELECT dados FROM lotes INDEXED BY lotes_atualizado{onde} "
+                    "ORDER BY atualizado_em DESC, id DESC LIMIT ?",
+                    [*parametros, limite],
+                ).fetchall()
+        return pd.DataFrame([json.loads(dados) for dados, in linhas], columns=COLUNAS_LOTE), total
+
+    def total(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM lotes").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
@@ -1,42 +1,216 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
-from megaleiloes import scrape_megaleiloes
-from alfaleiloes import scrape_alfaleiloes
+import motor
+from esquema import COLUNAS_LOTE, lotes_unificados
+from normalizacao import StatusLote, normalizar_lotes
+from deduplicacao import deduplicar_lotes
+from progresso import ProgressoColeta
+from exportacao import FORMATOS, exportar_dataframe
+from indice_busca import IndiceLotes, LIMITE_RANKING, LIMITE_RESULTADOS
+
+# Sites disponíveis (adaptadores registrados no motor): nome na interface -> adaptador
+SITES = {adaptador.nome: adaptador for adaptador in motor.carregar_adaptadores().values()}
+INTERVALO_ATUALIZACAO = 1  # segundos entre as atualizações do painel durante a coleta
+TTL_RESULTADOS = 30 * 60  # segundos em que uma coleta completa é reaproveitada para os mesmos sites e páginas
+ARQUIVO_INDICE = "indice_lotes.db"  # Índice de busca com os lotes de todas as coletas (indice_busca.py)
+# Coletas de sessões diferentes rodando ao mesmo tempo; as demais esperam na fila (e o painel mostra isso)
+COLETAS_SIMULTANEAS = int(os.environ.get("SCRAPER_COLETAS_SIMULTANEAS", "4"))
+
+
+@st.cache_resource
+def obter_executor():
+    # Compartilhado pelas sessões do servidor: as coletas continuam rodando entre as
+    # reexecuções do script, que só leem o progresso. Uma thread por site para cada uma
+    # de COLETAS_SIMULTANEAS sessões (os Chromes continuam limitados pelo pool do motor)
+    return ThreadPoolExecutor(max_workers=len(SITES) * COLETAS_SIMULTANEAS, thread_name_prefix="coleta")
+
+
+@st.cache_resource
+def obter_indice():
+    # Uma conexão para o servidor inteiro; os lotes entram no índice conforme ficam prontos
+    return IndiceLotes(ARQUIVO_INDICE)
+
+
+def iniciar_coleta(nomes, paginas):
+    coleta = {}
+    for nome in nomes:
+        progresso = ProgressoColeta(SITES[nome].site)
+        coleta[nome] = {
+            "progresso": progresso,
+            "futuro": obter_executor().submit(motor.raspar, SITES[nome], paginas, progresso=progresso),
+            "linhas": [],
+        }
+    return coleta
+
+
+def formatar_duracao(segundos):
+    if segundos is None:
+        return "--"
+    minutos, segundos = divmod(int(segundos), 60)
+    return f"{minutos}min {segundos:02d}s" if minutos else f"{segundos}s"
+
+
+def mostrar_progresso(nome, item):
+    progresso = item["progresso"]
+    # Acrescenta os lotes que ficaram prontos desde a última atualização (na tabela e no índice de busca)
+    novos = list(lotes_unificados(progresso.novos_registros(), progresso.site))
+    item["linhas"].extend(novos)
+    obter_indice().adicionar(novos)
+    if progresso.estado == "aguardando" and not item["futuro"].done():
+        # Todas as threads de coleta ocupadas por outras sessões
+        st.progress(0.0, text=f"**{nome}** | na fila: aguardando o fim de outras coletas")
+        return
+    previstos = progresso.lotes_previstos()
+    paginas = f"{progresso.paginas}/{progresso.total_paginas or '?'}"
+    st.progress(
+        min(progresso.concluidos / previstos, 1.0) if previstos else 0.0,
+        text=f"**{nome}** | páginas {paginas} | lotes {progresso.concluidos}/{previstos} | "
+             f"{progresso.lotes_por_segundo():.1f} lotes/s | ETA {formatar_duracao(progresso.eta())}",
+    )
+
+
+@st.fragment(run_every=INTERVALO_ATUALIZACAO)
+def painel_coleta():
+    # Reexecuta só este trecho a cada segundo enquanto as coletas estão em andamento
+    coleta = st.session_state["coleta"]
+    if st.button("Cancelar Scraping"):
+        for item in coleta.values():
+            item["progresso"].cancelar()
+        st.info("Cancelando: os imóveis em andamento serão concluídos e os demais descartados...")
+    for nome, item in coleta.items():
+        mostrar_progresso(nome, item)
+    linhas = [linha for item in coleta.values() for linha in item["linhas"]]
+    if linhas:
+        st.dataframe(pd.DataFrame(linhas, columns=COLUNAS_LOTE))
+    if all(item["futuro"].done() for item in coleta.values()):
+        # Coletas encerradas: uma última execução completa mostra o resultado final
+        st.rerun(scope="app")
+
+
+def resultados_em_cache():
+    # Resultados desta sessão, por (sites, páginas); os vencidos são descartados
+    resultados = st.session_state.setdefault("resultados", {})
+    for chave in [c for c, r in resultados.items() if time.time() - r["coletado_em"] > TTL_RESULTADOS]:
+        del resultados[chave]
+    return resultados
+
+
+def finalizar_coleta(coleta):
+    """Monta o resultado final (tabela normalizada e mensagens) de uma coleta encerrada."""
+    dados_coletados, mensagens, parcial = [], [], False
+    for nome, item in coleta.items():
+        progresso, futuro = item["progresso"], item["futuro"]
+        if futuro.exception() is not None:
+            mensagens.append(("error", f"Erro ao coletar dados da {nome}: {futuro.exception()}"))
+            parcial = True
+            continue
+        if progresso.cancelado.is_set():
+            mensagens.append(("warning", f"Coleta da {nome} cancelada: {progresso.concluidos} imóveis concluídos."))
+            parcial = True
+        else:
+            mensagens.append(("success", f"Dados da {nome} coletados com sucesso!"))
+        dados_coletados.extend(lotes_unificados(futuro.result(), progresso.site))
+
+    df = None
+    if dados_coletados:
+        # Os lotes que o painel ainda não tinha indexado (os já indexados não mudam)
+        obter_indice().adicionar(dados_coletados)
+        df = normalizar_lotes(pd.DataFrame(dados_coletados, columns=COLUNAS_LOTE))
+        if len(coleta) > 1:
+            # O mesmo imóvel anunciado nos dois sites vira uma única linha
+            mesclados, removidos = deduplicar_lotes(df)
+            df = pd.DataFrame(mesclados).drop(columns=["origem_campos"])
+            mensagens.append(("info", f"{removidos} anúncios duplicados entre os sites foram unidos."))
+    # Coletas canceladas ou com erro são exibidas, mas não reaproveitadas por outra busca
+    return {"df": df, "mensagens": mensagens, "parcial": parcial, "coletado_em": time.time(), "arquivos": {}}
+
+
+def mostrar_resultado(resultado):
+    for tipo, mensagem in resultado["mensagens"]:
+        getattr(st, tipo)(mensagem)
+    df = resultado["df"]
+    if df is None:
+        return
+    st.dataframe(df)
+
+    # Download gerado em memória a partir do resultado guardado (sem refazer a coleta)
+    formato = st.radio("Formato do arquivo:", list(FORMATOS), horizontal=True, format_func=str.upper)
+    if formato not in resultado["arquivos"]:
+        resultado["arquivos"][formato] = exportar_dataframe(df, formato)
+    st.download_button(
+        "Download dos dados",
+        data=resultado["arquivos"][formato],
+        file_name=f"dados_leiloes.{formato}",
+        mime=FORMATOS[formato],
+    )
+
+
+def painel_busca():
+    """Busca por palavras em título/descrição, com filtros de valor, status e site, em todos os lotes já coletados."""
+    indice = obter_indice()
+    st.subheader(f"Buscar nos lotes coletados ({indice.total()} lotes)")
+    texto = st.text_input("Palavras no título ou na descrição (ex.: apartamento moema desocupado):")
+    coluna_min, coluna_max = st.columns(2)
+    valor_min = coluna_min.number_input("Valor mínimo (R$)", min_value=0.0, value=None, step=10000.0)
+    valor_max = coluna_max.number_input("Valor máximo (R$)", min_value=0.0, value=None, step=10000.0)
+    status = st.multiselect("Status", [status.value for status in StatusLote])
+    sites = st.multiselect("Sites", list(SITES))
+    inicio = time.perf_counter()
+    df, total = indice.buscar(texto, valor_min, valor_max, status, [SITES[nome].site for nome in sites])
+    decorrido = (time.perf_counter() - inicio) * 1000
+    if texto.strip() and total > LIMITE_RANKING:
+        st.caption(f"Mais de {LIMITE_RANKING} lotes encontrados em {decorrido:.0f} ms: mostrando os "
+                   f"{LIMITE_RESULTADOS} atualizados mais recentemente (acrescente palavras ou filtros para "
+                   f"ordenar por relevância)")
+    else:
+        mostrando = f" (mostrando os {LIMITE_RESULTADOS} primeiros)" if total > LIMITE_RESULTADOS else ""
+        st.caption(f"{total} lotes encontrados em {decorrido:.0f} ms{mostrando}")
+    st.dataframe(df)
+
 
 st.title("Interface de Scraping de Leilões")
 
 # Seletor de sites para scraping
 st.subheader("Selecione os sites para realizar o scraping:")
-mega_selected = st.checkbox("Mega Leilões")
-alfa_selected = st.checkbox("Alfa Leilões")
+selecionados = [nome for nome in SITES if st.checkbox(nome)]
 
 # Campo para entrada do número de páginas
 paginas = st.text_input("Digite o número de páginas a serem raspadas (ou 'todas'):", "1")
 
-# Botão para iniciar o scraping
-if st.button("Iniciar Scraping"):
-    if not mega_selected and not alfa_selected:
+# Campo para refazer a coleta mesmo havendo resultado recente para os mesmos sites e páginas
+ignorar_cache = st.checkbox("Ignorar resultados já coletados nesta sessão")
+
+resultados = resultados_em_cache()
+coleta = st.session_state.get("coleta")
+em_andamento = coleta is not None and not all(item["futuro"].done() for item in coleta.values())
+
+# Botão para iniciar o scraping (os sites selecionados são raspados ao mesmo tempo)
+if st.button("Iniciar Scraping", disabled=em_andamento):
+    chave = (tuple(selecionados), paginas.strip().lower())
+    if not selecionados:
         st.warning("Por favor, selecione pelo menos um site para realizar o scraping.")
+    elif chave in resultados and not resultados[chave]["parcial"] and not ignorar_cache:
+        st.session_state["atual"] = chave
+        minutos = int(time.time() - resultados[chave]["coletado_em"]) // 60
+        st.info(f"Mostrando a coleta feita há {minutos} min para estes sites e páginas.")
     else:
-        dados_coletados = []
-
-        if mega_selected:
-            with st.spinner("Raspando dados da Mega Leilões..."):
-                dados_mega = scrape_megaleiloes(paginas)
-                dados_coletados.extend(dados_mega)
-            st.success("Dados da Mega Leilões coletados com sucesso!")
-
-        if alfa_selected:
-            with st.spinner("Raspando dados da Alfa Leilões..."):
-                dados_alfa = scrape_alfaleiloes(paginas)
-                dados_coletados.extend(dados_alfa)
-            st.success("Dados da Alfa Leilões coletados com sucesso!")
-
-        if dados_coletados:
-            df = pd.DataFrame(dados_coletados)
-            st.dataframe(df)
-
-            # Botão para download dos dados em Excel
-            if st.button("Download dos dados em Excel"):
-                df.to_excel("dados_leiloes.xlsx", index=False)
-                st.success("Arquivo Excel gerado com sucesso!")
+        st.session_state["coleta"] = coleta = iniciar_coleta(selecionados, paginas)
+        st.session_state["chave_coleta"] = chave
+        em_andamento = True
+
+if em_andamento:
+    painel_coleta()
+else:
+    if coleta is not None:
+        # Coleta recém-encerrada: o resultado passa a ser servido pelo cache da sessão
+        chave = st.session_state.pop("chave_coleta")
+        resultados[chave] = finalizar_coleta(st.session_state.pop("coleta"))
+        st.session_state["atual"] = chave
+    if st.session_state.get("atual") in resultados:
+        mostrar_resultado(resultados[st.session_state["atual"]])
+
+painel_busca()
@@ -0,0 +1,833 @@
+# ============================================================
+# Motor de coleta comum a todos os sites de leilão
+# ============================================================
+# Cada site é descrito por um adaptador (subclasse de AdaptadorSite) com o que é
+# específico dele: URL da listagem, XPaths dos cards e dos campos de detalhe,
+# nomes dos documentos e textos da planilha. Todo o resto fica aqui e vale para
+# qualquer site registrado: listagem com o pool de Chrome, extração via HTTP ou
+# Selenium, pipeline concorrente com limites por domínio, cache HTTP, coleta
+# incremental, checkpoint, progresso/cancelamento, exportação XLSX/Parquet e
+# métricas por etapa/campo (perfil.py, --metricas na linha de comando).
+#
+# Para incluir um novo leiloeiro: crie um módulo com a subclasse do adaptador,
+# registre-o com registrar() e acrescente o módulo a MODULOS_SITES.
+
+import importlib
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from lxml import html
+
+from selenium.webdriver.common.by import By  # Para localizar elementos
+from selenium.webdriver.support import expected_conditions as EC  # Condições de espera
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE  # Para remover caracteres ilegais no Excel
+
+from navegador import obter_pool, aguardar  # Pool de sessões do Chrome já iniciadas e esperas condicionais
+from perfil import PerfilTempo, definir_silencioso, detalhe  # Métricas por etapa e modo silencioso
+from agendador import (  # Extração concorrente com limites por domínio
+    executar_pipeline, limitador_padrao, MAX_CONCORRENCIA_POR_HOST)
+from coleta_http import buscar_documento, obter_cache, texto_elemento  # Coleta sem navegador
+from retentativa import (  # Novas tentativas com backoff e disjuntor por domínio
+    politica_padrao, e_retentavel, PaginaNaoCarregou, CircuitoAberto)
+from exportacao import escrever_xlsx, escrever_parquet  # Planilha XLSX e Parquet gravados em streaming
+from esquema import lotes_unificados  # Esquema de lote comum aos sites
+from checkpoint import Checkpoint  # Gravação contínua dos registros para retomada (--resume)
+from estado_coleta import assinatura_card  # Coleta incremental (ver estado_coleta.py)
+from documentos import ColetorDocumentos, WORKERS_PADRAO as WORKERS_DOCUMENTOS  # Download dos PDFs dos lotes
+from textos_documentos import ExtratorTextos  # Texto e campos (avaliação, área, matrícula, débitos) dos PDFs
+from campos import extrair_campos_js, extrair_cards_js, extrair_campos_lxml, extrair_cards_lxml, relatar_campos
+
+# Módulos com os adaptadores dos sites (cada um chama registrar() ao ser importado)
+MODULOS_SITES = ["megaleiloes", "alfaleiloes"]
+
+TIMEOUT_LISTAGEM = 10  # Tempo máximo esperando cards; esgota apenas em páginas vazias
+MAX_PAGINAS_SONDAGEM = 10_000  # Limite da sondagem do total de páginas (sites que repetem a última página)
+
+RE_NUMERO_PAGINA = re.compile(r"[?&](?:page|pagina)=(\d+)")  # Número da página no href do paginador
+RE_TOTAL_RESULTADOS = re.compile(r"(\d[\d.]*)")  # Ex.: "1.234 imóveis encontrados"
+
+
+# ============================================================
+# 1. Utilitários
+# ============================================================
+
+def print_header(message):
+    print("\n" + "=" * 70)
+    print(f"{message}".center(70))
+    print("=" * 70 + "\n")
+
+
+def detalhe_header(message):
+    # print_header das mensagens por lote, omitido no modo silencioso
+    detalhe("\n" + "=" * 70)
+    detalhe(f"{message}".center(70))
+    detalhe("=" * 70 + "\n")
+
+
+# Função para limpar textos removendo caracteres ilegais para o Excel
+def clean_text(text):
+    if text is None:
+        return ""
+    return ILLEGAL_CHARACTERS_RE.sub("", text)
+
+
+def parse_paginas(paginas):
+    """Converte a entrada do usuário ("todas" ou um número) no total de páginas (None = todas)."""
+    if str(paginas).strip().lower() == "todas":
+        return None
+    return int(paginas)
+
+
+# ============================================================
+# 2. Adaptador de site e registro dos sites disponíveis
+# ============================================================
+
+class AdaptadorSite:
+    """Partes específicas de um site. As subclasses definem os atributos abaixo e,
+    se o site precisar, sobrescrevem os ganchos (métodos) de listagem e documentos."""
+
+    site = None  # Identificador no esquema unificado (ex.: "megaleiloes")
+    nome = None  # Nome exibido nos logs e na interface (ex.: "Mega Leilões")
+    base_url = None  # URL da listagem com o marcador {page}
+
+    xpath_cards = None  # Cards da listagem
+    xpath_container_cards = None  # Se definido, aguardado antes dos cards (página vazia não espera duas vezes)
+    xpath_detalhe_pronto = None  # Elemento que indica que a página do lote terminou de carregar
+    xpath_paginacao = None  # Links do paginador da listagem (o maior número de página é o total)
+    xpath_total_resultados = None  # Texto com o total de lotes da busca (alternativa ao paginador)
+    listagem_http = False  # True se os cards vêm no HTML do servidor: a listagem dispensa o Chrome
+    campos_card = {}  # campos.campo() de cada card; precisa de "status", "link" e "texto"
+    campos_detalhe = {}  # campos.campo() da página do lote
+    rotulos_detalhe = {}  # Rótulos usados no log de cada campo de detalhe
+    nomes_documentos = []  # Documentos que viram colunas na planilha
+
+    # Planilha XLSX e linha de comando
+    coluna_descricao = "Descrição do Imóvel"
+    titulo_planilha = "Leilões"
+    arquivo_padrao = "leiloes_formatado.xlsx"
+    mostrar_registros = False  # Imprime todos os registros coletados antes de exportar (depuração)
+
+    def total_paginas(self, documento, cards_por_pagina):
+        """Total de páginas informado pela primeira página da listagem (None = sondar)."""
+        return paginas_informadas(documento, self.xpath_paginacao, self.xpath_total_resultados, cards_por_pagina)
+
+    def ignorar_card(self, valores, status):
+        """True para descartar um card da listagem (ex.: lotes já vendidos)."""
+        return False
+
+    def documentos_navegador(self, driver, valores, perfil):
+        """Documentos do lote aberto no navegador; por padrão, os campos de campos_detalhe com esses nomes."""
+        return {doc: valores.get(doc) for doc in self.nomes_documentos}
+
+    def documentos_http(self, documento, valores, link, pool, perfil):
+        """Documentos do lote a partir do HTML baixado (documento lxml)."""
+        return {doc: valores.get(doc) for doc in self.nomes_documentos}
+
+    def montar_registro(self, link, valores, documentos, status_leilao=""):
+        edital = valores.get("edital_leilao")
+        if edital is None and documentos:
+            edital = documentos.get("Edital")
+        return {
+            "link": link,
+            "titulo_leilao": valores["titulo_leilao"],
+            "tipo_leilao": valores["tipo_leilao"],
+            "numero_processo": valores["numero_processo"],
+            "valor_imovel": valores["valor_imovel"],
+            "edital_leilao": edital,
+            "documentos": documentos,
+            "descricao_lote": valores["descricao_lote"],
+            "status": status_leilao
+        }
+
+
+ADAPTADORES = {}
+
+
+def registrar(adaptador):
+    """Registra o adaptador pelo identificador do site e o devolve."""
+    ADAPTADORES[adaptador.site] = adaptador
+    return adaptador
+
+
+def carregar_adaptadores():
+    """Importa os módulos de MODULOS_SITES e devolve {site: adaptador}."""
+    for modulo in MODULOS_SITES:
+        importlib.import_module(modulo)
+    return ADAPTADORES
+
+
+# ============================================================
+# 3. Coleta dos Links dos Imóveis das Páginas Desejadas
+# ============================================================
+
+def paginas_informadas(documento, xpath_paginacao=None, xpath_total_resultados=None, cards_por_pagina=0):
+    """Total de páginas lido do paginador ou do total de resultados de uma página de listagem.
+
+    No paginador vale o maior número de página encontrado no texto ou no href dos
+    links (ex.: "Última" -> ?pagina=42). O total de resultados é dividido pela
+    quantidade de cards da página. Retorna None se a página não informa nenhum dos dois.
+    """
+    if xpath_paginacao:
+        numeros = []
+        for elemento in documento.xpath(xpath_paginacao):
+            texto = texto_elemento(elemento)
+            if texto.isdigit():
+                numeros.append(int(texto))
+            numero = RE_NUMERO_PAGINA.search(elemento.get("href") or "")
+            if numero:
+                numeros.append(int(numero.group(1)))
+        if numeros:
+            return max(numeros)
+    if xpath_total_resultados and cards_por_pagina:
+        for elemento in documento.xpath(xpath_total_resultados):
+            total = RE_TOTAL_RESULTADOS.search(texto_elemento(elemento))
+            if total:
+                return math.ceil(int(total.group(1).replace(".", "")) / cards_por_pagina)
+    return None
+
+
+def sondar_total_paginas(tem_cards, maximo=MAX_PAGINAS_SONDAGEM):
+    """Última página com cards quando o site não informa o total.
+
+    Sonda as páginas 2, 4, 8... até achar uma vazia e faz busca binária entre a
+    última com cards e a primeira vazia: O(log páginas) acessos em vez de todas.
+    `tem_cards(pagina)` lê a página e diz se ela tem cards.
+    """
+    com_cards, vazia = 1, None
+    pagina = 2
+    while vazia is None:
+        if pagina > maximo:
+            return maximo
+        if tem_cards(pagina):
+            com_cards, pagina = pagina, pagina * 2
+        else:
+            vazia = pagina
+    while vazia - com_cards > 1:
+        meio = (com_cards + vazia) // 2
+        if tem_cards(meio):
+            com_cards = meio
+        else:
+            vazia = meio
+    return com_cards
+
+
+def ler_pagina_listagem(adaptador, pool, url, perfil, com_documento=False):
+    """Lê uma página de listagem e devolve (cards, documento lxml).
+
+    Com adaptador.listagem_http a página é baixada sem navegador; senão usa um
+    Chrome do pool. O documento só é montado no modo navegador se `com_documento`.
+    """
+    ao_repetir = _contar_repeticao(perfil, "listagem")
+    if adaptador.listagem_http:
+        try:
+            with perfil.medir("listagem.download"):
+                documento = buscar_documento(url, ao_repetir=ao_repetir)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return [], None  # Alguns sites respondem 404 depois da última página
+            raise
+        with perfil.medir("listagem.cards"):
+            cards = extrair_cards_lxml(documento, adaptador.xpath_cards, adaptador.campos_card)
+        perfil.contar("paginas_listagem")
+        return cards, documento
+
+    documento = None
+    with pool.driver() as driver, limitador_padrao.slot(url):
+        # Aguarda até os cards aparecerem (no lugar dos antigos sleeps fixos)
+        with perfil.medir("listagem.download"):
+            politica_padrao.executar(url, lambda: driver.get(url), ao_repetir)
+            if adaptador.xpath_container_cards is None or aguardar(
+                    driver, EC.presence_of_element_located((By.XPATH, adaptador.xpath_container_cards)),
+                    TIMEOUT_LISTAGEM):
+                aguardar(driver, EC.presence_of_element_located((By.XPATH, adaptador.xpath_cards)),
+                         TIMEOUT_LISTAGEM)
+        # Status e link de todos os cards numa única chamada ao navegador
+        with perfil.medir("listagem.cards"):
+            cards = extrair_cards_js(driver, adaptador.xpath_cards, adaptador.campos_card)
+            if com_documento:
+                documento = html.fromstring(driver.page_source, base_url=url)
+    perfil.contar("paginas_listagem")
+    return cards, documento
+
+
+def links_dos_cards(adaptador, cards, perfil):
+    links_pagina = []  # (link, status, assinatura do card) dos cards desta página
+    for index, (valores, origem) in enumerate(cards, start=1):
+        status_text = (valores["status"] or "").strip()
+        if adaptador.ignorar_card(valores, status_text):
+            perfil.contar("cards_ignorados")
+            detalhe(f"  [INFO] Card {index} com status '{status_text}'. Ignorando.")
+            continue
+        link = valores["link"]
+        if not link:
+            perfil.contar("campo_nao_encontrado", campo="card.link")
+            detalhe(f"  [ERRO] Card {index}: link não encontrado")
+            continue
+        links_pagina.append((link, status_text, assinatura_card(valores["texto"])))
+        detalhe(f"  [OK] Card {index}: {link} (Status: {status_text})")
+    return links_pagina
+
+
+def iterar_links(adaptador, pool, total_pages, base_url=None, perfil=None, progresso=None, workers=None):
+    """Lê as páginas de listagem e gera (link, status, assinatura) na ordem das páginas.
+
+    A primeira página informa o total de páginas (paginador ou total de resultados,
+    ver AdaptadorSite.total_paginas); sem essa informação, "todas" é resolvido por
+    sondagem (sondar_total_paginas). As demais páginas são lidas em paralelo por até
+    `workers` threads, dentro dos limites do domínio (padrão: o tamanho do pool de
+    Chrome, ou MAX_CONCORRENCIA_POR_HOST na listagem via HTTP). Os detalhes podem
+    começar a ser extraídos enquanto as páginas seguintes ainda estão carregando
+    (ver raspar() e agendador.executar_pipeline).
+
+    Ao se esgotar, o gerador retorna False se a listagem foi interrompida por erro antes
+    da última página (nem todos os lotes do site foram vistos) e True caso contrário.
+    """
+    base_url = base_url or adaptador.base_url
+    perfil = perfil or PerfilTempo()
+    workers = workers or (MAX_CONCORRENCIA_POR_HOST if adaptador.listagem_http else pool.tamanho_max)
+    print_header(f"Coletando Links dos Imóveis - {adaptador.nome}")
+    print(f"[INFO] Páginas a serem raspadas: {'Todas' if total_pages is None else total_pages}")
+
+    lidas = {}  # página -> cards já lidos (primeira página e sondagens)
+
+    def ler(pagina, com_documento=False):
+        url = base_url.format(page=pagina)
+        detalhe(f"[INFO] Acessando: {url}")
+        cards, documento = ler_pagina_listagem(adaptador, pool, url, perfil, com_documento)
+        lidas[pagina] = cards
+        return documento
+
+    def tem_cards(pagina):
+        if pagina not in lidas:
+            ler(pagina)
+        return bool(lidas[pagina])
+
+    try:
+        documento = ler(1, com_documento=True)
+        if not lidas[1]:
+            total = 1
+        else:
+            informado = adaptador.total_paginas(documento, len(lidas[1]))
+            if informado is not None:
+                print(f"[INFO] Total de páginas informado pelo site: {informado}")
+                total = informado if total_pages is None else min(total_pages, informado)
+            elif total_pages is None:
+                print("[INFO] O site não informa o total de páginas; sondando...")
+                total = sondar_total_paginas(tem_cards)
+                print(f"[INFO] Última página com itens: {total}")
+            else:
+                total = total_pages
+    except CircuitoAberto as e:
+        # Site fora do ar: nada a coletar
+        print(f"[ERRO] Listagem interrompida: {e}")
+        return False
+    if progresso is not None:
+        progresso.definir_total_paginas(total)
+
+    total_links = 0
+    completa = True
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="listagem")
+    # Janela deslizante: no máximo `workers` páginas em leitura ou lidas à espera do consumidor
+    # (memória limitada e os Chromes do pool continuam livres para os detalhes)
+    a_ler = (pagina for pagina in range(2, total + 1) if pagina not in lidas)
+    futuros = {}
+
+    def enviar_proxima():
+        pagina = next(a_ler, None)
+        if pagina is not None:
+            futuros[pagina] = executor.submit(ler, pagina)
+
+    for _ in range(max(1, workers)):
+        enviar_proxima()
+    try:
+        for pagina in range(1, total + 1):
+            if pagina in futuros:
+                try:
+                    futuros.pop(pagina).result()
+                except Exception as e:
+                    # Ex.: site fora do ar: encerra a listagem e mantém o que já foi coletado
+                    print(f"[ERRO] Listagem interrompida na Página {pagina}: {e}")
+                    completa = False
+                    break
+                enviar_proxima()
+            cards = lidas.pop(pagina)
+            print(f"[INFO] Itens encontrados na página {pagina}: {len(cards)}")
+            if len(cards) == 0:
+                print("[INFO] Nenhum item encontrado. Encerrando coleta.")
+                break
+
+            links_pagina = links_dos_cards(adaptador, cards, perfil)
+            total_links += len(links_pagina)
+            if progresso is not None:
+                progresso.pagina_lida(len(links_pagina))
+            print(f"[INFO] Total de links coletados até a Página {pagina}: {total_links}")
+            yield from links_pagina
+    finally:
+        # Cancelamento ou fim antecipado: páginas que ainda não começaram são descartadas
+        for futuro in futuros.values():
+            futuro.cancel()
+        executor.shutdown(wait=True)
+
+    print_header("Total de Links Coletados")
+    print(f"[INFO] Total de imóveis coletados: {total_links}")
+    return completa
+
+
+# ============================================================
+# 4. Processamento dos Imóveis (Extração dos Dados)
+# ============================================================
+
+def _documentos(funcao, perfil, *args):
+    # Falha nos documentos não descarta o restante do lote
+    try:
+        with perfil.medir("detalhe.documentos"):
+            return funcao(*args, perfil)
+    except Exception as e:
+        perfil.contar("erro_documentos", tipo=type(e).__name__)
+        print(f"  [ERRO] Documentos: {e}")
+        return None
+
+
+def _contar_repeticao(perfil, etapa):
+    def ao_repetir(tentativa, erro):
+        perfil.contar("nova_tentativa", etapa=etapa, tipo=type(erro).__name__)
+        detalhe(f"  [AVISO] Tentativa {tentativa} falhou ({type(erro).__name__}); tentando de novo.")
+    return ao_repetir
+
+
+def _registrar_campos(perfil, tempos):
+    for nome, segundos in tempos.items():
+        perfil.registrar("campo", segundos, campo=nome)
+
+
+def extrair_imovel(adaptador, driver, link, status_leilao="", perfil=None):
+    perfil = perfil or PerfilTempo()
+
+    def abrir():
+        driver.get(link)
+        if aguardar(driver, EC.presence_of_element_located((By.XPATH, adaptador.xpath_detalhe_pronto))) is None:
+            raise PaginaNaoCarregou(f"página do lote não terminou de carregar: {link}")
+
+    # Abre o lote em uma nova aba e aguarda a página carregar (recarregando se falhar)
+    driver.execute_script("window.open();")
+    driver.switch_to.window(driver.window_handles[-1])
+    try:
+        with perfil.medir("detalhe.download"):
+            politica_padrao.executar(link, abrir, _contar_repeticao(perfil, "detalhe"))
+        # Todos os campos numa única chamada ao navegador
+        tempos = {}
+        with perfil.medir("detalhe.campos"):
+            valores, origem = extrair_campos_js(driver, adaptador.campos_detalhe, tempos)
+        _registrar_campos(perfil, tempos)
+        relatar_campos(valores, origem, adaptador.rotulos_detalhe, perfil)
+        documentos = _documentos(adaptador.documentos_navegador, perfil, driver, valores)
+    finally:
+        # Fecha a aba do imóvel e retorna à aba principal
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+
+    return adaptador.montar_registro(link, valores, documentos, status_leilao)
+
+
+def extrair_imovel_http(adaptador, link, status_leilao="", pool=None, perfil=None):
+    """Mesma extração de extrair_imovel(), mas baixando a página via HTTP e lendo com lxml.
+
+    O adaptador pode recorrer ao `pool` de navegadores só para o que depender de
+    JavaScript (ex.: o modal de documentos da Alfa Leilões).
+    """
+    perfil = perfil or PerfilTempo()
+    with perfil.medir("detalhe.download"):
+        documento = buscar_documento(link, ao_repetir=_contar_repeticao(perfil, "detalhe"))
+
+    tempos = {}
+    with perfil.medir("detalhe.campos"):
+        valores, origem = extrair_campos_lxml(documento, adaptador.campos_detalhe, tempos)
+    _registrar_campos(perfil, tempos)
+    relatar_campos(valores, origem, adaptador.rotulos_detalhe, perfil)
+    documentos = _documentos(adaptador.documentos_http, perfil, documento, valores, link, pool)
+
+    return adaptador.montar_registro(link, valores, documentos, status_leilao)
+
+
+def registro_vazio(link, status_leilao=""):
+    # Registro usado quando a página do lote não pôde ser processada
+    return {
+        "link": link,
+        "titulo_leilao": None,
+        "tipo_leilao": None,
+        "numero_processo": None,
+        "valor_imovel": None,
+        "edital_leilao": None,
+        "documentos": None,
+        "descricao_lote": None,
+        "status": status_leilao
+    }
+
+
+def raspar(adaptador, paginas, base_url=None, pool=None, modo="http", workers=4, perfil=None,
+           estado=None, somente_alteracoes=False, checkpoint=None, progresso=None, arquivo_metricas=None,
+           repassagens=1):
+    """Raspa o site do adaptador e retorna a lista de imóveis (um dicionário por lote).
+
+    Não faz nenhuma interação com o usuário: o driver vem do pool compartilhado
+    e é devolvido ao final, pronto para a próxima chamada. Com modo="http" as
+    páginas de detalhe são baixadas sem navegador (o adaptador ainda pode usar
+    o Chrome para partes que dependem de JavaScript); modo="selenium" abre cada
+    lote numa aba do Chrome.
+
+    `workers` define quantos lotes são processados ao mesmo tempo; o limite de
+    concorrência e de requisições por segundo de cada domínio fica em agendador.py.
+    Ao final é impresso o tempo gasto em cada etapa e os contadores de fallbacks
+    e erros (passe um PerfilTempo em `perfil` para consultá-lo depois). Com
+    `arquivo_metricas` as métricas também são gravadas nele (JSON Lines, ou texto
+    do Prometheus se terminar em .prom; ver PerfilTempo.gravar_metricas).
+
+    Com `estado` (um estado_coleta.EstadoColeta) a coleta é incremental: lotes cujo
+    card não mudou reaproveitam o registro salvo sem abrir a página, e ao final é
+    impresso o diff (novos, alterados, desaparecidos). Com `somente_alteracoes`
+    apenas os lotes novos ou alterados são devolvidos.
+
+    Com `checkpoint` (um checkpoint.Checkpoint) cada lote extraído é gravado em
+    disco assim que fica pronto, e lotes já presentes no checkpoint são pulados.
+
+    Cada página é pedida de novo em falhas transitórias (retentativa.py). Lotes que
+    ainda assim falharem por um motivo transitório voltam para o fim da fila: depois
+    da listagem terminar são feitas até `repassagens` novas passadas só com eles, em
+    vez de ficarem como linhas em branco.
+
+    Com `progresso` (um progresso.ProgressoColeta) páginas e lotes concluídos são
+    publicados à medida que ficam prontos, e progresso.cancelar() interrompe a
+    coleta: os lotes em andamento terminam e os demais são descartados.
+    """
+    if modo not in ("http", "selenium"):
+        raise ValueError(f"Modo de coleta inválido: {modo!r} (use 'http' ou 'selenium')")
+    total_pages = parse_paginas(paginas)
+    pool = pool or obter_pool()
+    perfil = perfil or PerfilTempo()
+    if progresso is not None:
+        progresso.iniciar(total_pages)
+    pendentes = {}  # índice -> item dos lotes com falha transitória, refeitos ao final
+    refazer = {}  # lotes da passada atual de novas tentativas
+    lock_pendentes = threading.Lock()
+    repassagem = 0
+
+    def processar(i, item):
+        link, status_leilao, assinatura = item
+        if checkpoint is not None and checkpoint.concluido(link) is not None:
+            perfil.contar("lotes_checkpoint")
+            detalhe(f"[INFO] Imóvel {i} já concluído no checkpoint: {link}")
+            if estado is not None:
+                # Visto nesta execução: sem isso o lote retomado seria dado como desaparecido
+                estado.marcar_visto(link)
+            return checkpoint.concluido(link)
+        if estado is not None:
+            anterior = estado.registro_inalterado(link, status_leilao, assinatura)
+            if anterior is not None:
+                perfil.contar("lotes_inalterados")
+                detalhe(f"[INFO] Imóvel {i} inalterado desde a última coleta: {link}")
+                if checkpoint is not None:
+                    checkpoint.gravar(anterior)
+                return anterior
+
+        detalhe_header(f"Processando Imóvel {i}")
+        detalhe(f"[INFO] URL: {link}")
+        inicio = time.perf_counter()
+        try:
+            if modo == "http":
+                imovel_info = extrair_imovel_http(adaptador, link, status_leilao, pool, perfil)
+            else:
+                # Cada worker usa seu próprio Chrome do pool, respeitando o limite do domínio
+                with pool.driver() as driver, limitador_padrao.slot(link):
+                    imovel_info = extrair_imovel(adaptador, driver, link, status_leilao, perfil)
+        except Exception as e:
+            if e_retentavel(e) and repassagem < repassagens:
+                with lock_pendentes:
+                    pendentes[i] = item
+                perfil.contar("lote_reenfileirado", tipo=type(e).__name__)
+                print(f"  [AVISO] Imóvel {i}: {e} (será tentado de novo ao final)")
+                return registro_vazio(link, status_leilao)
+            perfil.contar("erro_lote", tipo=type(e).__name__)
+            print(f"  [ERRO] Imóvel {i}: {e}")
+            if estado is not None:
+                estado.marcar_visto(link)
+            return registro_vazio(link, status_leilao)
+
+        if estado is not None:
+            estado.salvar(link, imovel_info, status_leilao, assinatura)
+        if checkpoint is not None:
+            checkpoint.gravar(imovel_info)
+
+        perfil.contar("lotes_extraidos")
+        perfil.registrar("lote", time.perf_counter() - inicio)  # latência de ponta a ponta do lote
+        detalhe_header(f"Dados Extraídos do Imóvel {i}")
+        for chave, valor in imovel_info.items():
+            detalhe(f"{chave:20}: {valor}")
+        return imovel_info
+
+    listagem_completa = False  # Só vira True se a listagem chegar ao fim sem erro
+
+    def listagem():
+        nonlocal listagem_completa
+        listagem_completa = yield from iterar_links(adaptador, pool, total_pages, base_url, perfil, progresso)
+
+    def ao_concluir(i, registro):
+        # Lotes reenfileirados só são publicados quando a nova passada os concluir
+        if progresso is not None and i not in pendentes:
+            progresso.lote_concluido(registro)
+
+    def reprocessar(_, i):
+        # Nova passada: o lote mantém o índice da listagem
+        return i, processar(i, refazer[i])
+
+    def ao_reprocessar(_, resultado):
+        ao_concluir(*resultado)
+
+    # A listagem roda nesta thread e alimenta a fila enquanto os workers extraem os
+    # detalhes; os resultados voltam na mesma ordem da listagem. Com um único Chrome
+    # no pool a fila fica sem limite, senão a listagem e os workers esperariam um pelo outro.
+    tamanho_fila = None if pool.tamanho_max > 1 else 0
+    cancelar = progresso.cancelado if progresso is not None else None
+    try:
+        all_imoveis_data = executar_pipeline(listagem(), processar, workers, tamanho_fila, ao_concluir, cancelar)
+        while pendentes and not (cancelar is not None and cancelar.is_set()):
+            repassagem += 1
+            refazer = dict(pendentes)
+            pendentes.clear()
+            print_header(f"Tentando de Novo {len(refazer)} Imóveis com Falha Transitória")
+            # O resultado de cada lote substitui o registro vazio da passada anterior
+            for i, registro in executar_pipeline(iter(sorted(refazer)), reprocessar, workers, 0,
+                                                 ao_reprocessar, cancelar):
+                all_imoveis_data[i - 1] = registro
+    except Exception as e:
+        if progresso is not None:
+            progresso.finalizar(erro=e)
+        raise
+    cancelada = cancelar is not None and cancelar.is_set()
+
+    print_header(f"Tempo por Etapa - {adaptador.nome}")
+    print(perfil.relatorio())
+    if obter_cache() is not None:
+        print(obter_cache().relatorio())
+    if arquivo_metricas:
+        perfil.gravar_metricas(arquivo_metricas, site=adaptador.site)
+        print(f"[INFO] Métricas gravadas em: {arquivo_metricas}")
+
+    if estado is not None:
+        # Execução cancelada ou listagem interrompida não viu todos os lotes:
+        # nenhum pode ser dado como desaparecido
+        diff = estado.finalizar(completa=total_pages is None and listagem_completa and not cancelada)
+        print_header(f"Diferenças desde a Última Coleta - {adaptador.nome}")
+        print(f"[INFO] Novos: {len(diff['novos'])} | Alterados: {len(diff['alterados'])} | "
+              f"Desaparecidos: {len(diff['desaparecidos'])} | Inalterados: {diff['inalterados']}")
+        for link in diff["desaparecidos"]:
+            print(f"  [REMOVIDO] {link}")
+        if somente_alteracoes:
+            alterados = set(diff["novos"]) | set(diff["alterados"])
+            all_imoveis_data = [item for item in all_imoveis_data if item["link"] in alterados]
+    if progresso is not None:
+        progresso.finalizar()
+    return all_imoveis_data
+
+
+# ============================================================
+# 5. Exportação (XLSX estilizado e Parquet)
+# ============================================================
+
+# Colunas dos campos tirados dos PDFs (--extrair-textos): chave do registro -> coluna
+COLUNAS_TEXTOS = {
+    "valor_avaliacao": "Valor de Avaliação",
+    "area_m2": "Área (m²)",
+    "numero_matricula": "Nº da Matrícula",
+    "debitos": "Débitos",
+}
+
+
+def colunas_planilha(adaptador, campos_documentos=False):
+    # Define a ordem das colunas (incluindo "Status", os documentos do site e,
+    # se os PDFs foram lidos, os campos tirados deles)
+    return [
+        "ID", "Título do Leilão", "Tipo de Leilão", "Número do Processo",
+        "Valor do Imóvel", "Link do Edital", "Link do Imóvel", adaptador.coluna_descricao,
+        "Status"
+    ] + adaptador.nomes_documentos + (list(COLUNAS_TEXTOS.values()) if campos_documentos else [])
+
+
+def formatar_linhas(adaptador, all_imoveis_data):
+    # Converte cada imóvel coletado numa linha da planilha, mapeando as chaves originais para
+    # nomes de colunas “amigáveis” e aplicando clean_text (gerador: uma linha por vez)
+    for idx, item in enumerate(all_imoveis_data, start=1):
+        documentos = item.get("documentos") or {}
+        row = {
+            "ID": f"Imóvel {idx}",
+            "Título do Leilão": clean_text(str(item.get("titulo_leilao", ""))),
+            "Tipo de Leilão": clean_text(str(item.get("tipo_leilao", ""))),
+            "Número do Processo": clean_text(str(item.get("numero_processo", ""))),
+            "Valor do Imóvel": clean_text(str(item.get("valor_imovel", ""))),
+            "Link do Edital": clean_text(str(item.get("edital_leilao", ""))),
+            "Link do Imóvel": clean_text(str(item.get("link", ""))),
+            adaptador.coluna_descricao: clean_text(str(item.get("descricao_lote", ""))),
+            "Status": clean_text(str(item.get("status", "")))
+        }
+        # Acrescenta as colunas de documentos
+        for doc in adaptador.nomes_documentos:
+            row[doc] = clean_text(str(documentos.get(doc, "")))
+        for chave, coluna in COLUNAS_TEXTOS.items():
+            row[coluna] = item.get(chave)
+        yield row
+
+
+def salvar_xlsx(adaptador, all_imoveis_data, caminho_arquivo, campos_documentos=False):
+    """Grava os imóveis (lista ou gerador) na planilha XLSX sem montá-la inteira em memória."""
+    # Colunas com links recebem formatação de hyperlink
+    link_columns = ["Link do Edital", "Link do Imóvel"] + adaptador.nomes_documentos
+    return escrever_xlsx(formatar_linhas(adaptador, all_imoveis_data), caminho_arquivo,
+                         colunas_planilha(adaptador, campos_documentos), link_columns, adaptador.titulo_planilha)
+
+
+def salvar_parquet(adaptador, all_imoveis_data, diretorio):
+    """Acrescenta os imóveis ao histórico Parquet (particionado por site e data da coleta)."""
+    return escrever_parquet(lotes_unificados(all_imoveis_data, adaptador.site), diretorio)
+
+
+def processar_documentos(all_imoveis_data, diretorio, perfil, workers=WORKERS_DOCUMENTOS, cota_mb=None,
+                         extrair_textos=False, processos=None):
+    """Baixa os documentos dos imóveis para `diretorio` e, com `extrair_textos`, acrescenta aos
+    registros o texto dos PDFs e os campos tirados dele (avaliação, área, matrícula, débitos)."""
+    print_header("Baixando os documentos dos lotes")
+    cota = int(cota_mb * 1024 * 1024) if cota_mb else None
+    coletor = ColetorDocumentos(diretorio, workers=workers, cota_bytes=cota)
+    try:
+        with perfil.medir("documentos.download"):
+            resumo = coletor.coletar(all_imoveis_data)
+        if extrair_textos:
+            # Só os documentos dos lotes desta coleta (o manifesto guarda todo o histórico)
+            links = {registro.get("link") for registro in all_imoveis_data}
+            manifesto = [documento for documento in coletor.manifesto() if documento["lote"] in links]
+    finally:
+        coletor.fechar()
+    perfil.contar("documentos_baixados", resumo["baixados"])
+    perfil.contar("documentos_duplicados", resumo["duplicados"])
+    perfil.contar("erro_documento", resumo["falhas"])
+    print(f"[INFO] {coletor.relatorio()}")
+    if not extrair_textos:
+        return
+
+    print_header("Extraindo o texto dos documentos")
+    extrator = ExtratorTextos(diretorio, processos=processos)
+    try:
+        with perfil.medir("documentos.textos"):
+            extrator.aplicar(all_imoveis_data, manifesto)
+    finally:
+        extrator.fechar()
+    perfil.contar("textos_extraidos", extrator.extraidos)
+    perfil.contar("erro_texto_documento", extrator.falhas)
+    perfil.contar("documentos_nao_pdf", extrator.ignorados)
+    for campo in COLUNAS_TEXTOS:
+        perfil.contar("campo_documento_encontrado",
+                      sum(imovel.get(campo) is not None for imovel in all_imoveis_data), campo=campo)
+    print(f"[INFO] {extrator.relatorio()}")
+
+
+# ============================================================
+# 6. Execução interativa (linha de comando + escolha do arquivo XLSX)
+# ============================================================
+
+def executar_interativo(adaptador):
+    import argparse
+    import tkinter as tk
+    from tkinter import filedialog
+
+    parser = argparse.ArgumentParser(description=f"Scraping de imóveis da {adaptador.nome}")
+    parser.add_argument("--resume", action="store_true",
+                        help="retoma a execução anterior, pulando os imóveis já gravados no checkpoint")
+    parser.add_argument("--checkpoint", default=f"checkpoint_{adaptador.site}.jsonl",
+                        help="arquivo onde cada imóvel extraído é gravado (JSON Lines)")
+    parser.add_argument("--parquet", metavar="DIRETORIO",
+                        help="também acrescenta os imóveis ao histórico Parquet neste diretório")
+    parser.add_argument("--documentos", metavar="DIRETORIO",
+                        help="baixa os documentos dos lotes (editais, matrículas, laudos) para este diretório")
+    parser.add_argument("--workers-documentos", type=int, default=WORKERS_DOCUMENTOS,
+                        help="downloads de documentos em paralelo")
+    parser.add_argument("--cota-documentos", type=float, metavar="MB",
+                        help="espaço máximo em disco ocupado pelos documentos")
+    parser.add_argument("--extrair-textos", action="store_true",
+                        help="lê os PDFs baixados (--documentos) e acrescenta avaliação, área, matrícula e débitos")
+    parser.add_argument("--processos", type=int,
+                        help="processos usados na leitura dos PDFs (padrão: um por núcleo)")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="grava as métricas da execução (tempo por etapa e por campo, fallbacks, erros) "
+                             "em JSON Lines ou, se terminar em .prom, no formato de texto do Prometheus")
+    parser.add_argument("--silencioso", action="store_true",
+                        help="não imprime os detalhes de cada card, lote e campo (apenas os resumos)")
+    args = parser.parse_args()
+    if args.extrair_textos and not args.documentos:
+        parser.error("--extrair-textos requer --documentos")
+    if args.silencioso:
+        definir_silencioso()
+
+    paginas_input = input("Digite o número de páginas a serem raspadas (ou 'todas'): ")
+    perfil = PerfilTempo()
+    checkpoint = Checkpoint(args.checkpoint, retomar=args.resume)
+    try:
+        all_imoveis_data = raspar(adaptador, paginas_input, perfil=perfil, checkpoint=checkpoint)
+    finally:
+        checkpoint.fechar()
+
+    if adaptador.mostrar_registros and not args.silencioso:
+        # (Opcional: DEBUG) Verifica o conteúdo coletado
+        print_header("DEBUG: Verificando o Conteúdo de all_imoveis_data")
+        for idx, imovel in enumerate(all_imoveis_data, start=1):
+            print(f"\nImóvel #{idx}:")
+            for k, v in imovel.items():
+                print(f"  {k} => {v}")
+
+    if args.documentos:
+        processar_documentos(all_imoveis_data, args.documentos, perfil, args.workers_documentos,
+                             args.cota_documentos, args.extrair_textos, args.processos)
+
+    if args.parquet:
+        print_header("Exportando os dados para Parquet")
+        with perfil.medir("exportacao.parquet"):
+            arquivos = salvar_parquet(adaptador, all_imoveis_data, args.parquet)
+        for arquivo in arquivos:
+            print(f"[SUCESSO] Parquet gravado em: {arquivo}")
+
+    print_header("Escolha onde salvar a planilha XLSX")
+    root = tk.Tk()
+    root.withdraw()
+    root.lift()
+    root.attributes("-topmost", True)
+
+    caminho_arquivo = filedialog.asksaveasfilename(
+        initialfile=adaptador.arquivo_padrao,
+        defaultextension=".xlsx",
+        filetypes=[("Planilhas Excel", "*.xlsx")],
+        title="Salvar planilha como"
+    )
+
+    if caminho_arquivo:
+        try:
+            print_header("Preparando os dados para exportação para XLSX")
+            with perfil.medir("exportacao.xlsx"):
+                salvar_xlsx(adaptador, all_imoveis_data, caminho_arquivo, campos_documentos=args.extrair_textos)
+            print(f"[SUCESSO] Planilha XLSX salva com sucesso em:\n{caminho_arquivo}")
+        except Exception as e:
+            perfil.contar("erro_exportacao", formato="xlsx")
+            print(f"[ERRO] Erro ao salvar a planilha: {e}")
+    else:
+        print("[CANCELADO] Nenhum arquivo foi salvo.")
+
+    if args.metricas:
+        # Gravadas só aqui para incluir também o tempo de exportação
+        perfil.gravar_metricas(args.metricas, site=adaptador.site)
+        print(f"[INFO] Métricas gravadas em: {args.metricas}")
+
+    # ============================================================
+    # 7. Finaliza o Navegador
+    # ============================================================
+    print_header("Finalizando o Scraping e Fechando o Navegador...")
+    obter_pool().encerrar()
@@ -0,0 +1,225 @@
+# ============================================================
+# Pool de navegadores Chrome (Headless) compartilhado pelos scrapers
+# ============================================================
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver  # Para controlar o navegador
+from selenium.webdriver.chrome.service import Service  # Para configurar o ChromeDriver
+from selenium.webdriver.chrome.options import Options  # Para definir opções do Chrome (ex: modo headless)
+from selenium.webdriver.support.ui import WebDriverWait  # Para esperas condicionais
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Atualize para o caminho do seu chromedriver (ou defina a variável CHROMEDRIVER_PATH).
+# Se o arquivo não existir, o Selenium Manager localiza o driver automaticamente.
+chrome_driver_path = os.environ.get(
+    "CHROMEDRIVER_PATH", "C:\\Users\\mathe\\Desktop\\chromedriver-win64\\chromedriver.exe"
+)
+
+
+# ============================================================
+# Perfis do navegador
+# ============================================================
+# "padrao": o Chrome como antes (baixa imagens, fontes, vídeos e scripts de terceiros).
+# "enxuto": bloqueia tudo o que a extração não usa (imagens, mídia, fontes e
+# domínios de analytics/anúncios), desativa extensões e usa o carregamento
+# "eager" (driver.get volta no DOMContentLoaded; as esperas por elementos
+# continuam garantindo que os dados estão na página). O JavaScript dos próprios
+# sites continua ativo: a Alfa Leilões depende dele para o modal de documentos.
+PERFIS = ("padrao", "enxuto")
+PERFIL_PADRAO = os.environ.get("SCRAPER_PERFIL_NAVEGADOR", "enxuto")
+
+# Padrões de URL bloqueados no perfil enxuto (Network.setBlockedURLs do DevTools)
+EXTENSOES_BLOQUEADAS = [
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif",  # imagens
+    "mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8",  # mídia
+    "woff", "woff2", "ttf", "otf", "eot",  # fontes
+]
+DOMINIOS_TERCEIROS = [
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "googleadservices.com", "facebook.net", "facebook.com", "connect.facebook.net", "hotjar.com",
+    "clarity.ms", "tiktok.com", "analytics.tiktok.com", "criteo.com", "taboola.com", "outbrain.com",
+    "jivosite.com", "zendesk.com", "tawk.to", "youtube.com", "ytimg.com", "fonts.googleapis.com",
+    "fonts.gstatic.com", "rdstation.com.br",
+]
+
+
+def urls_bloqueadas(extras=()):
+    padroes = [f"*.{extensao}" for extensao in EXTENSOES_BLOQUEADAS]
+    padroes += [f"*.{extensao}?*" for extensao in EXTENSOES_BLOQUEADAS]
+    padroes += [f"*://{dominio}/*" for dominio in DOMINIOS_TERCEIROS]
+    padroes += [f"*://*.{dominio}/*" for dominio in DOMINIOS_TERCEIROS]
+    return padroes + list(extras)
+
+
+def criar_opcoes_chrome(perfil="padrao"):
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil de navegador inválido: {perfil!r} (use {' ou '.join(PERFIS)})")
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    if perfil == "enxuto":
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+        })
+    return chrome_options
+
+
+def criar_driver(perfil=None, bloquear=()):
+    """Inicia um Chrome no perfil pedido (padrão: SCRAPER_PERFIL_NAVEGADOR ou "enxuto").
+
+    `bloquear` acrescenta padrões de URL aos bloqueados pelo perfil enxuto.
+    """
+    perfil = perfil or PERFIL_PADRAO
+    if chrome_driver_path and os.path.exists(chrome_driver_path):
+        service = Service(executable_path=chrome_driver_path)
+    else:
+        service = Service()
+    driver = webdriver.Chrome(service=service, options=criar_opcoes_chrome(perfil))
+    if perfil == "enxuto":
+        # Bloqueio feito pelo próprio navegador: as requisições nem chegam a sair
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls_bloqueadas(bloquear)})
+    return driver
+
+
+class PoolNavegadores:
+    """Mantém sessões do Chrome já iniciadas para reaproveitá-las entre execuções.
+
+    Iniciar o ChromeDriver custa alguns segundos; o pool entrega um driver
+    ocioso quando houver e só cria um novo quando todos estiverem em uso.
+    """
+
+    def __init__(self, tamanho_max=2, fabrica=criar_driver):
+        self.tamanho_max = tamanho_max
+        self._fabrica = fabrica
+        self._ociosos = []  # Pilha: o driver devolvido por último (mais "quente") sai primeiro
+        self._criados = 0
+        # Quem espera um driver acorda quando um é devolvido ou descartado (vaga para criar outro)
+        self._condicao = threading.Condition()
+
+    def aquecer(self, quantidade=1):
+        """Inicia drivers antecipadamente para que a primeira coleta não pague o cold start."""
+        with self._condicao:
+            novos = max(0, min(quantidade, self.tamanho_max) - self._criados)
+            self._criados += novos
+        for iniciados in range(novos):
+            try:
+                driver = self._fabrica()
+            except Exception:
+                with self._condicao:
+                    self._criados -= novos - iniciados
+                    self._condicao.notify_all()
+                raise
+            with self._condicao:
+                self._ociosos.append(driver)
+                self._condicao.notify()
+
+    def _obter(self):
+        with self._condicao:
+            while True:
+                if self._ociosos:
+                    return self._ociosos.pop()
+                if self._criados < self.tamanho_max:
+                    self._criados += 1
+                    break
+                self._condicao.wait()
+        try:
+            return self._fabrica()
+        except Exception:
+            with self._condicao:
+                self._criados -= 1
+                self._condicao.notify()
+            raise
+
+    def _devolver(self, driver):
+        # Fecha abas extras deixadas pela coleta e volta para a aba principal;
+        # se o driver não responder, ele é descartado.
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception:
+            self._descartar(driver)
+            return
+        with self._condicao:
+            self._ociosos.append(driver)
+            self._condicao.notify()
+
+    def _descartar(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._condicao:
+            self._criados -= 1
+            self._condicao.notify()
+
+    @contextmanager
+    def driver(self):
+        driver = self._obter()
+        try:
+            yield driver
+        except WebDriverException as e:
+            # Falha do próprio navegador (sessão morta, Chrome travado): o driver é trocado.
+            # Um timeout de espera não diz nada sobre a sessão; _devolver() testa se ela responde.
+            if isinstance(e, TimeoutException):
+                self._devolver(driver)
+            else:
+                self._descartar(driver)
+            raise
+        except BaseException:
+            # Erro da extração (página sem o elemento, campo inválido...): o Chrome continua bom
+            self._devolver(driver)
+            raise
+        else:
+            self._devolver(driver)
+
+    def encerrar(self):
+        with self._condicao:
+            ociosos, self._ociosos = self._ociosos, []
+        for driver in ociosos:
+            self._descartar(driver)
+
+
+_pool_padrao = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool():
+    """Retorna o pool global, criado na primeira chamada e encerrado ao sair do processo."""
+    global _pool_padrao
+    with _pool_lock:
+        if _pool_padrao is None:
+            _pool_padrao = PoolNavegadores(tamanho_max=int(os.environ.get("SCRAPER_POOL_SIZE", "2")))
+            atexit.register(_pool_padrao.encerrar)
+        return _pool_padrao
+
+
+# ============================================================
+# Esperas condicionais (substituem os time.sleep fixos)
+# ============================================================
+
+TIMEOUT_PADRAO = 15  # Segundos máximos de espera por um elemento
+
+
+def aguardar(driver, condicao, timeout=TIMEOUT_PADRAO):
+    """Espera a condição do Selenium ser satisfeita e retorna seu valor; None se o tempo esgotar."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(condicao)
+    except TimeoutException:
+        return None
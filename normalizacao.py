@@ -0,0 +1,85 @@
+# ============================================================
+# Normalização vetorizada dos lotes (valor, processo e status)
+# ============================================================
+# Os scrapers guardam o texto como aparece no site ("R$ 1.234.567,89",
+# "Processo nº 0001234-56.2023.8.26.0100", "Aberto para lances"...).
+# normalizar_lotes() trabalha sobre o DataFrame inteiro com operações de string
+# do pandas (sem laço Python por registro) e acrescenta colunas tipadas:
+#   valor               -> float (reais), NaN quando não há valor
+#   numero_processo_cnj -> NNNNNNN-DD.AAAA.J.TR.OOOO, <NA> quando não é um número CNJ
+#   status_lote         -> categoria com os valores de StatusLote
+
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+
+class StatusLote(str, Enum):
+    ABERTO = "aberto"
+    EM_BREVE = "em_breve"
+    ENCERRADO = "encerrado"
+    ARREMATADO = "arrematado"
+    SUSPENSO = "suspenso"
+    CANCELADO = "cancelado"
+    DESCONHECIDO = "desconhecido"
+
+
+# Palavras-chave (sem acento, minúsculas) de cada status, na ordem de prioridade:
+# "Encerrado - Arrematado" é arrematado, "Suspenso" vence "aberto" etc.
+PADROES_STATUS = [
+    (StatusLote.ARREMATADO, r"arrematad|vendid"),
+    (StatusLote.CANCELADO, r"cancelad|retirad|desistencia"),
+    (StatusLote.SUSPENSO, r"suspens|sustad"),
+    (StatusLote.ENCERRADO, r"encerrad|finalizad|sem licitante|deserto|fracassad"),
+    (StatusLote.EM_BREVE, r"breve|futuro|agendad"),
+    (StatusLote.ABERTO, r"abert|andamento|aceitando|disputa|lances|repasse|venda direta|online"),
+]
+
+# Valor precedido de "R$" (o primeiro, quando há 1º e 2º leilão) ou, sem "R$", o primeiro número
+RE_VALOR_REAIS = r"R\$\s*(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:,\d{1,2})?)"
+RE_VALOR = r"(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+,\d{1,2})"
+# Número CNJ com ou sem pontuação (20 dígitos)
+RE_CNJ = r"(\d{7}\s*-?\s*\d{2}\s*\.?\s*\d{4}\s*\.?\s*\d\s*\.?\s*\d{2}\s*\.?\s*\d{4})"
+
+
+def _texto(serie):
+    return serie.astype("string")
+
+
+def normalizar_valor(serie):
+    """Converte textos como "R$ 1.234.567,89" em float (1234567.89); NaN quando não há valor."""
+    texto = _texto(serie)
+    numero = texto.str.extract(RE_VALOR_REAIS, expand=False)
+    numero = numero.fillna(texto.str.extract(RE_VALOR, expand=False))
+    numero = numero.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(numero, errors="coerce").astype("float64")
+
+
+def normalizar_processo(serie):
+    """Extrai o número CNJ e o formata como NNNNNNN-DD.AAAA.J.TR.OOOO."""
+    digitos = _texto(serie).str.extract(RE_CNJ, expand=False).str.replace(r"\D", "", regex=True)
+    return digitos.str.replace(
+        r"^(\d{7})(\d{2})(\d{4})(\d)(\d{2})(\d{4})$", r"\1-\2.\3.\4.\5.\6", regex=True
+    )
+
+
+def normalizar_status(serie):
+    """Mapeia o texto de status do site para StatusLote (categoria do pandas)."""
+    texto = (
+        _texto(serie).fillna("").str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore").str.decode("ascii").str.lower()
+    )
+    condicoes = [texto.str.contains(padrao, regex=True).to_numpy(dtype=bool) for _, padrao in PADROES_STATUS]
+    valores = np.select(condicoes, [status.value for status, _ in PADROES_STATUS],
+                        default=StatusLote.DESCONHECIDO.value)
+    return pd.Categorical(valores, categories=[status.value for status in StatusLote])
+
+
+def normalizar_lotes(df):
+    """Acrescenta valor, numero_processo_cnj e status_lote ao DataFrame de lotes (retorna uma cópia)."""
+    df = df.copy()
+    df["valor"] = normalizar_valor(df["valor_imovel"])
+    df["numero_processo_cnj"] = normalizar_processo(df["numero_processo"])
+    df["status_lote"] = normalizar_status(df["status"])
+    return df
@@ -0,0 +1,181 @@
+# ============================================================
+# Perfil de tempo e métricas por execução
+# ============================================================
+# Tempo por etapa (listagem, download e campos do detalhe, documentos,
+# exportação...), tempo de cada campo extraído e contadores (fallbacks de
+# seletor, campos não encontrados e erros). Ao final da execução tudo pode ser
+# gravado em JSON Lines ou no formato de texto do Prometheus (gravar_metricas).
+#
+# Modo silencioso (definir_silencioso(True) ou SCRAPER_SILENCIOSO=1): os prints
+# por card, por lote e por campo (feitos com detalhe()) deixam de ser emitidos;
+# só os resumos de cada etapa continuam no console.
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+silencioso = os.environ.get("SCRAPER_SILENCIOSO", "") == "1"
+
+
+def definir_silencioso(ativo=True):
+    global silencioso
+    silencioso = ativo
+
+
+def detalhe(*args, **kwargs):
+    """print() das mensagens por card/lote/campo, omitido no modo silencioso."""
+    if not silencioso:
+        print(*args, **kwargs)
+
+
+def _escapar(valor):
+    # Valor de rótulo no formato de texto do Prometheus
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted(rotulos.items()))
+
+
+class PerfilTempo:
+    """Acumula o tempo gasto em cada etapa ("listagem.download", "detalhe.campos", ...).
+
+    Seguro para uso com vários workers: cada medição soma no total da etapa.
+    Com workers em paralelo os totais são tempo de CPU/espera somado, não tempo de relógio.
+    Medições aninhadas não são contadas duas vezes: uma espera dentro de um
+    bloco de extração é descontada do tempo da extração.
+
+    Das séries em `amostrar` (ex.: ("lote",)) cada tempo registrado também é
+    guardado, para percentis (percentil()); das demais, só a soma e a contagem.
+    """
+
+    def __init__(self, amostrar=()):
+        self.inicio = time.perf_counter()
+        self._totais = defaultdict(float)
+        self._contagens = defaultdict(int)
+        self._series = defaultdict(lambda: [0.0, 0])  # (série, rótulos) -> [segundos, medições]
+        self._contadores = defaultdict(int)  # (contador, rótulos) -> valor
+        self._amostras = {serie: [] for serie in amostrar}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def medir(self, etapa):
+        pilha = self._local.__dict__.setdefault("pilha", [])
+        pilha.append(0.0)  # tempo consumido por medições internas
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            decorrido = time.perf_counter() - inicio
+            interno = pilha.pop()
+            if pilha:
+                pilha[-1] += decorrido
+            with self._lock:
+                self._totais[etapa] += decorrido - interno
+                self._contagens[etapa] += 1
+
+    def registrar(self, serie, segundos, **rotulos):
+        """Soma um tempo já medido a uma série com rótulos (ex.: registrar("campo", 0.01, campo="valor"))."""
+        with self._lock:
+            acumulado = self._series[_chave(serie, rotulos)]
+            acumulado[0] += segundos
+            acumulado[1] += 1
+            if serie in self._amostras:
+                self._amostras[serie].append(segundos)
+
+    def percentil(self, serie, p):
+        """Percentil `p` (0-100) dos tempos da série amostrada, ou None se ainda não há amostras."""
+        with self._lock:
+            amostras = sorted(self._amostras.get(serie, ()))
+        if not amostras:
+            return None
+        return amostras[min(len(amostras) - 1, round(p / 100 * (len(amostras) - 1)))]
+
+    def contar(self, contador, quantidade=1, **rotulos):
+        """Incrementa um contador com rótulos (ex.: contar("fallback_seletor", campo="valor_imovel"))."""
+        with self._lock:
+            self._contadores[_chave(contador, rotulos)] += quantidade
+
+    def totais(self):
+        with self._lock:
+            return {etapa: (self._totais[etapa], self._contagens[etapa]) for etapa in self._totais}
+
+    def contadores(self):
+        with self._lock:
+            return {chave: valor for chave, valor in self._contadores.items()}
+
+    def relatorio(self, titulo="Perfil de tempo"):
+        duracao = time.perf_counter() - self.inicio
+        linhas = [f"{titulo} (duração total: {duracao:.1f} s)"]
+        for etapa, (total, contagem) in sorted(self.totais().items(), key=lambda par: -par[1][0]):
+            media = total / contagem if contagem else 0.0
+            linhas.append(f"  {etapa:20}: {total:9.2f} s em {contagem:6} medições (média {media * 1000:.0f} ms)")
+        for (contador, rotulos), valor in sorted(self.contadores().items()):
+            descricao = ", ".join(f"{nome}={valor_rotulo}" for nome, valor_rotulo in rotulos)
+            linhas.append(f"  {contador}{f' ({descricao})' if descricao else ''}: {valor}")
+        return "\n".join(linhas)
+
+    # ------------------------------------------------------------------
+    # Exportação das métricas
+    # ------------------------------------------------------------------
+
+    def metricas(self, **rotulos):
+        """Todas as medições como dicionários planos (um por métrica), com `rotulos` em cada um."""
+        duracao = time.perf_counter() - self.inicio
+        with self._lock:
+            linhas = [dict(rotulos, metrica="duracao", segundos=duracao)]
+            for etapa in self._totais:
+                linhas.append(dict(rotulos, metrica="etapa", etapa=etapa,
+                                   segundos=self._totais[etapa], medicoes=self._contagens[etapa]))
+            for (serie, rotulos_serie), (segundos, medicoes) in self._series.items():
+                linhas.append(dict(rotulos, metrica=serie, **dict(rotulos_serie),
+                                   segundos=segundos, medicoes=medicoes))
+            for (contador, rotulos_contador), valor in self._contadores.items():
+                linhas.append(dict(rotulos, metrica=contador, **dict(rotulos_contador), valor=valor))
+        return linhas
+
+    def texto_prometheus(self, **rotulos):
+        tipos, amostras = {}, []
+
+        def amostra(nome, valor, tipo, rotulos_amostra):
+            nome = "scraper_" + nome.replace(".", "_")
+            tipos[nome] = tipo
+            texto = ",".join(f'{chave}="{_escapar(v)}"' for chave, v in rotulos_amostra.items())
+            amostras.append((nome, f"{nome}{{{texto}}} {valor}" if texto else f"{nome} {valor}"))
+
+        for linha in self.metricas(**rotulos):
+            metrica = linha.pop("metrica")
+            if "valor" in linha:
+                amostra(f"{metrica}_total", linha.pop("valor"), "counter", linha)
+            elif metrica == "duracao":
+                amostra("duracao_segundos", round(linha.pop("segundos"), 6), "gauge", linha)
+            else:
+                medicoes = linha.pop("medicoes")
+                segundos = round(linha.pop("segundos"), 6)
+                amostra(f"{metrica}_segundos_total", segundos, "counter", linha)
+                amostra(f"{metrica}_medicoes_total", medicoes, "counter", linha)
+
+        saida = []
+        for nome in sorted(tipos):
+            saida.append(f"# TYPE {nome} {tipos[nome]}")
+            saida.extend(texto for amostra_nome, texto in amostras if amostra_nome == nome)
+        return "\n".join(saida) + "\n"
+
+    def gravar_metricas(self, caminho, **rotulos):
+        """Grava as métricas em `caminho`: .prom/.txt no formato do Prometheus (sobrescreve),
+        qualquer outra extensão em JSON Lines (acrescenta, uma linha por métrica)."""
+        if os.path.splitext(caminho)[1] in (".prom", ".txt"):
+            temporario = caminho + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                arquivo.write(self.texto_prometheus(**rotulos))
+            os.replace(temporario, caminho)  # o coletor nunca lê um arquivo pela metade
+            return
+        instante = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            for linha in self.metricas(**rotulos):
+                arquivo.write(json.dumps(dict(linha, instante=instante), ensure_ascii=False) + "\n")
@@ -0,0 +1,101 @@
+# ============================================================
+# Progresso de uma coleta em andamento (para interfaces em tempo real)
+# ============================================================
+# Os scrapers rodam em threads de fundo e só atualizam este objeto; a interface
+# (main.py) lê os contadores e os registros novos quando quiser, sem bloquear a
+# coleta. O mesmo objeto carrega o pedido de cancelamento: quando `cancelado` é
+# sinalizado, a listagem para e os workers descartam os lotes que ainda não começaram.
+
+import threading
+import time
+
+
+class ProgressoColeta:
+    def __init__(self, site):
+        self.site = site
+        self.cancelado = threading.Event()
+        self.total_paginas = None  # None = "todas"
+        self.paginas = 0
+        self.listados = 0
+        self.concluidos = 0
+        self.estado = "aguardando"  # aguardando, executando, concluido, cancelado, erro
+        self.erro = None
+        self._inicio = None
+        self._fim = None
+        self._registros = []
+        self._lidos = 0
+        self._lock = threading.Lock()
+
+    # Chamados pela coleta ---------------------------------------------------
+
+    def iniciar(self, total_paginas):
+        with self._lock:
+            self.total_paginas = total_paginas
+            self.estado = "executando"
+            self._inicio = time.monotonic()
+
+    def definir_total_paginas(self, total_paginas):
+        # Total descoberto na primeira página da listagem (também quando a entrada foi "todas")
+        with self._lock:
+            self.total_paginas = total_paginas
+
+    def pagina_lida(self, links):
+        with self._lock:
+            self.paginas += 1
+            self.listados += links
+
+    def lote_concluido(self, registro):
+        with self._lock:
+            self.concluidos += 1
+            self._registros.append(registro)
+
+    def finalizar(self, erro=None):
+        with self._lock:
+            self._fim = time.monotonic()
+            self.erro = erro
+            if erro is not None:
+                self.estado = "erro"
+            elif self.cancelado.is_set():
+                self.estado = "cancelado"
+            else:
+                self.estado = "concluido"
+
+    # Lidos pela interface ---------------------------------------------------
+
+    def cancelar(self):
+        self.cancelado.set()
+
+    @property
+    def ativo(self):
+        return self.estado in ("aguardando", "executando")
+
+    def novos_registros(self):
+        """Registros concluídos desde a última chamada (na ordem em que ficaram prontos)."""
+        with self._lock:
+            novos = self._registros[self._lidos:]
+            self._lidos = len(self._registros)
+            return novos
+
+    def decorrido(self):
+        if self._inicio is None:
+            return 0.0
+        return (self._fim or time.monotonic()) - self._inicio
+
+    def lotes_por_segundo(self):
+        decorrido = self.decorrido()
+        return self.concluidos / decorrido if decorrido > 0 else 0.0
+
+    def lotes_previstos(self):
+        """Total de lotes esperado: com número de páginas conhecido, projetado pela média
+        de lotes por página; com "todas", apenas os lotes já listados."""
+        previstos = self.listados
+        if self.total_paginas and self.paginas:
+            previstos = max(previstos, round(self.listados / self.paginas * self.total_paginas))
+        return previstos
+
+    def eta(self):
+        """Segundos estimados até o fim, ou None enquanto não há base para estimar."""
+        taxa = self.lotes_por_segundo()
+        if not self.ativo or not taxa:
+            return None
+        return max(self.lotes_previstos() - self.concluidos, 0) / taxa
@@ -0,0 +1,205 @@
+# ============================================================
+# Novas tentativas com backoff exponencial e disjuntor por domínio
+# ============================================================
+# Uma falha transitória (timeout, conexão recusada, HTTP 429/5xx) ao baixar uma
+# página não deve virar uma linha em branco: a página é pedida de novo, só ela,
+# com espera exponencial e jitter ("full jitter": sorteada entre 0 e o teto da
+# tentativa, para os workers não voltarem todos ao mesmo tempo).
+#
+# O disjuntor acompanha a taxa de erros recente de cada domínio. Quando ela passa
+# do limiar, o domínio é pausado (todas as requisições esperam) e depois testado
+# com uma única requisição. Se o domínio continuar fora do ar por várias pausas
+# seguidas, as requisições passam a falhar na hora com CircuitoAberto, em vez de
+# consumirem a execução inteira em esperas.
+
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+
+TENTATIVAS_PADRAO = 4  # Total de tentativas por página (a primeira + 3 novas)
+ESPERA_BASE = 0.5  # Teto da espera da primeira nova tentativa (s); dobra a cada tentativa
+ESPERA_MAXIMA = 30.0
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+# Disjuntor: abre com LIMIAR_ERROS de erros entre as últimas JANELA requisições
+# (com pelo menos MINIMO_REQUISICOES), pausa o domínio por PAUSA segundos e
+# desiste do domínio depois de MAX_ABERTURAS aberturas seguidas sem nenhum sucesso
+LIMIAR_ERROS = 0.5
+JANELA = 20
+MINIMO_REQUISICOES = 8
+PAUSA = 15.0
+MAX_ABERTURAS = 3
+
+
+class PaginaNaoCarregou(Exception):
+    """A página abriu, mas o elemento que indica o fim do carregamento não apareceu."""
+
+
+class CircuitoAberto(Exception):
+    """O domínio foi dado como fora do ar pelo disjuntor."""
+
+
+# Trechos da mensagem de um WebDriverException genérico que indicam falha de rede,
+# do renderizador ou da ligação com o Chrome (e não da página ou do script de extração)
+MENSAGENS_WEBDRIVER_TRANSITORIAS = (
+    "net::err_", "timed out receiving message from renderer", "tab crashed", "target crashed",
+    "chrome not reachable", "disconnected", "session deleted", "connection refused",
+    "connection reset", "failed to establish a new connection",
+)
+
+
+def e_retentavel(erro):
+    """True para falhas que tendem a passar sozinhas (vale pedir a página de novo).
+
+    Erros determinísticos do Selenium (elemento inexistente, argumento inválido, erro de
+    JavaScript...) falham na hora: repetir daria o mesmo resultado.
+    """
+    if isinstance(erro, CircuitoAberto):
+        return False
+    if isinstance(erro, requests.HTTPError):
+        return erro.response is not None and erro.response.status_code in STATUS_RETENTAVEIS
+    if isinstance(erro, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                         PaginaNaoCarregou, TimeoutError, ConnectionError)):
+        return True
+    try:
+        from selenium.common.exceptions import (
+            InvalidSessionIdException, NoSuchWindowException, TimeoutException, WebDriverException)
+    except ImportError:
+        return False
+    # Tempo esgotado ou sessão/janela do Chrome perdida (o pool troca o driver)
+    if isinstance(erro, (TimeoutException, InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if type(erro) is WebDriverException:
+        mensagem = (erro.msg or str(erro)).lower()
+        return any(trecho in mensagem for trecho in MENSAGENS_WEBDRIVER_TRANSITORIAS)
+    return False
+
+
+class Disjuntor:
+    """Estado do disjuntor de um domínio: fechado, aberto (pausado) ou meio-aberto (testando)."""
+
+    def __init__(self, limiar=LIMIAR_ERROS, janela=JANELA, minimo=MINIMO_REQUISICOES,
+                 pausa=PAUSA, max_aberturas=MAX_ABERTURAS):
+        self.limiar = limiar
+        self.minimo = minimo
+        self.pausa = pausa
+        self.max_aberturas = max_aberturas
+        self.estado = "fechado"
+        self.aberturas = 0  # Aberturas seguidas sem nenhuma requisição bem-sucedida
+        self._resultados = deque(maxlen=janela)  # True = erro
+        self._reabre_em = 0.0
+        self._testando = None  # Marca da requisição que testa o domínio no estado meio-aberto
+        self._condicao = threading.Condition()
+
+    def permitir(self):
+        """Bloqueia enquanto o domínio está pausado; levanta CircuitoAberto se ele foi dado como fora do ar.
+
+        Retorna uma marca quando a requisição liberada é o teste do estado meio-aberto (None
+        nos demais casos): quem a recebe deve chamar encerrar_teste(marca) ao terminar.
+        """
+        with self._condicao:
+            while True:
+                if self.aberturas >= self.max_aberturas:
+                    raise CircuitoAberto(f"domínio indisponível após {self.aberturas} pausas seguidas")
+                if self.estado == "fechado":
+                    return None
+                agora = time.monotonic()
+                if self.estado == "aberto" and agora >= self._reabre_em:
+                    self.estado = "meio-aberto"
+                if self.estado == "meio-aberto" and self._testando is None:
+                    self._testando = object()  # Só esta requisição testa o domínio
+                    return self._testando
+                espera = self._reabre_em - agora if self.estado == "aberto" else None
+                self._condicao.wait(espera)
+
+    def registrar(self, erro):
+        with self._condicao:
+            if self.estado == "meio-aberto" and self._testando is not None:
+                self._testando = None
+                if erro:
+                    self._abrir()
+                else:
+                    self.estado, self.aberturas = "fechado", 0
+                    self._resultados.clear()
+                self._condicao.notify_all()
+                return
+            self._resultados.append(erro)
+            if not erro:
+                self.aberturas = 0
+            elif (self.estado == "fechado" and len(self._resultados) >= self.minimo
+                  and sum(self._resultados) / len(self._resultados) >= self.limiar):
+                self._abrir()
+                self._condicao.notify_all()
+
+    def encerrar_teste(self, marca):
+        """Libera o teste do estado meio-aberto que terminou sem registrar resultado
+        (ex.: KeyboardInterrupt): outra requisição passa a testar o domínio."""
+        with self._condicao:
+            if marca is not None and self._testando is marca:
+                self._testando = None
+                self._condicao.notify_all()
+
+    def _abrir(self):
+        self.estado = "aberto"
+        self.aberturas += 1
+        self._reabre_em = time.monotonic() + self.pausa
+        self._resultados.clear()
+        print(f"  [AVISO] Muitos erros seguidos: domínio pausado por {self.pausa:.0f} s "
+              f"({self.aberturas}/{self.max_aberturas})")
+
+
+class PoliticaRetentativa:
+    """Executa uma requisição com novas tentativas e o disjuntor do domínio da URL."""
+
+    def __init__(self, tentativas=TENTATIVAS_PADRAO, espera_base=ESPERA_BASE, espera_maxima=ESPERA_MAXIMA,
+                 **opcoes_disjuntor):
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.opcoes_disjuntor = opcoes_disjuntor
+        self._disjuntores = {}
+        self._lock = threading.Lock()
+
+    def disjuntor(self, url):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            if host not in self._disjuntores:
+                self._disjuntores[host] = Disjuntor(**self.opcoes_disjuntor)
+            return self._disjuntores[host]
+
+    def espera(self, tentativa):
+        """Espera antes da nova tentativa `tentativa` (1, 2, ...): sorteada entre 0 e o teto exponencial."""
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** (tentativa - 1)))
+
+    def executar(self, url, funcao, ao_repetir=None):
+        """Chama funcao() até dar certo; falhas não retentáveis e a última falha são propagadas.
+
+        `ao_repetir(tentativa, erro)` é chamado antes de cada nova tentativa (ex.: para contar).
+        """
+        disjuntor = self.disjuntor(url)
+        for tentativa in range(1, self.tentativas + 1):
+            teste = disjuntor.permitir()
+            try:
+                resultado = funcao()
+            except Exception as e:
+                retentavel = e_retentavel(e)
+                disjuntor.registrar(erro=retentavel)
+                if not retentavel or tentativa == self.tentativas:
+                    raise
+                erro = e
+            else:
+                disjuntor.registrar(erro=False)
+                return resultado
+            finally:
+                # Um teste interrompido sem resultado não pode travar o domínio para os demais
+                disjuntor.encerrar_teste(teste)
+            if ao_repetir is not None:
+                ao_repetir(tentativa, erro)
+            time.sleep(self.espera(tentativa))
+
+
+politica_padrao = PoliticaRetentativa()
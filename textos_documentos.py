@@ -0,0 +1,221 @@
+# ============================================================
+# Texto e campos dos documentos baixados (edital, laudo, matrícula...)
+# ============================================================
+# Etapa opcional depois de documentos.py: extrai o texto dos PDFs guardados, em
+# vários processos (a extração é CPU pura e não se beneficia de threads), e tira
+# dele por expressões regulares os dados que o site não mostra:
+#   valor_avaliacao  -> float (reais) do laudo de avaliação ou do edital
+#   area_m2          -> float, primeira área em m² encontrada
+#   numero_matricula -> texto, só os dígitos da matrícula do imóvel
+#   debitos          -> float (reais), soma dos débitos citados no primeiro documento que os cita
+# O texto de cada documento fica em registro["textos_documentos"] e os campos no
+# próprio registro.
+#
+# O texto é guardado no manifesto (manifesto.db) pelo SHA-256 do arquivo: um PDF
+# que não mudou nunca é lido duas vezes, nem o mesmo edital compartilhado por
+# vários lotes. Os campos são recalculados do texto a cada execução (é rápido), então
+# uma expressão regular corrigida vale para os documentos já extraídos.
+
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from documentos import e_pdf
+from esquema import COLUNAS_DOCUMENTOS
+
+MAX_PAGINAS = 100  # Editais muito longos: só as primeiras páginas têm os dados do lote
+TAREFAS_POR_ENVIO = 4  # PDFs enviados de uma vez a cada processo
+
+# Mesmo formato de normalizacao.RE_VALOR_REAIS, sem importar o pandas em cada processo
+RE_VALOR_REAIS = r"r\$\s*(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:,\d{1,2})?)"
+RE_NUMERO = r"(\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:,\d+)?)"
+
+# Aplicadas ao texto sem acentos e em minúsculas ("m²" vira "m2", "nº" vira "no")
+RE_AVALIACAO = re.compile(
+    r"(?:avaliad[oa]s?\s+(?:em|por)|valor\s+(?:da\s+|de\s+)?avaliacao|laudo\s+de\s+avaliacao)[^$\d]{0,40}"
+    + RE_VALOR_REAIS
+)
+RE_AREA = re.compile(
+    r"area\s+(?:total|privativa|construida|util|real|(?:do|de)\s+terreno)?[^\d]{0,30}?"
+    + RE_NUMERO + r"\s*(?:m2|metros\s+quadrados)"
+)
+RE_MATRICULA = re.compile(
+    r"matricula\s+(?:do\s+imovel\s+)?(?:n\.?\s*[o°]?\.?|numero)?\s*:?\s*(\d{1,3}(?:\.\d{3})+|\d{2,})\b"
+)
+RE_DEBITOS = re.compile(r"debitos?\b[^$]{0,80}?" + RE_VALOR_REAIS)
+PADROES = {"valor_avaliacao": RE_AVALIACAO, "area_m2": RE_AREA, "numero_matricula": RE_MATRICULA}
+
+CAMPOS_DOCUMENTOS = ("valor_avaliacao", "area_m2", "numero_matricula", "debitos")
+
+# Documentos consultados para cada campo, na ordem de preferência (colunas de
+# esquema.COLUNAS_DOCUMENTOS; os documentos que não estão na lista vêm por último)
+ORDEM_DOCUMENTOS = {
+    "valor_avaliacao": ("doc_laudo_avaliacao", "edital_leilao", "doc_matricula"),
+    "area_m2": ("doc_laudo_avaliacao", "doc_matricula", "edital_leilao"),
+    "numero_matricula": ("doc_matricula", "edital_leilao", "doc_laudo_avaliacao"),
+    "debitos": ("doc_debitos_tributarios", "doc_debito_exequendo", "edital_leilao"),
+}
+
+
+def extrair_texto(caminho, max_paginas=MAX_PAGINAS):
+    """Texto das primeiras `max_paginas` páginas de um PDF e o total de páginas."""
+    from pypdf import PdfReader
+
+    leitor = PdfReader(caminho)
+    paginas = (pagina.extract_text() or "" for pagina in islice(leitor.pages, max_paginas))
+    return "\n".join(paginas), len(leitor.pages)
+
+
+def _extrair(tarefa):
+    # Executada nos processos do pool: um PDF corrompido vira erro guardado, não exceção
+    sha256, caminho = tarefa
+    try:
+        texto, paginas = extrair_texto(caminho)
+        return sha256, texto, paginas, None
+    except Exception as e:
+        return sha256, "", 0, f"{type(e).__name__}: {e}"
+
+
+def _simplificar(texto):
+    sem_acentos = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in sem_acentos if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", sem_acentos).lower()
+
+
+def _numero(texto):
+    return float(texto.replace(".", "").replace(",", "."))
+
+
+def _coluna(nome):
+    return "edital_leilao" if nome == "Edital" else COLUNAS_DOCUMENTOS.get(nome, "outros_documentos")
+
+
+def campos_dos_textos(textos):
+    """Campos de CAMPOS_DOCUMENTOS a partir de {nome do documento: texto} (None quando não encontrados)."""
+    simplificados = {nome: _simplificar(texto) for nome, texto in textos.items() if texto}
+    campos = dict.fromkeys(CAMPOS_DOCUMENTOS)
+
+    for campo, preferidos in ORDEM_DOCUMENTOS.items():
+        ordem = sorted(simplificados, key=lambda nome: (
+            preferidos.index(_coluna(nome)) if _coluna(nome) in preferidos else len(preferidos)))
+        for nome in ordem:
+            texto = simplificados[nome]
+            if campo == "debitos":
+                # Soma os valores distintos citados (IPTU, condomínio...) do primeiro documento que os cita
+                valores = {_numero(m.group(1)) for m in RE_DEBITOS.finditer(texto)}
+                if valores:
+                    campos[campo] = sum(valores)
+                    break
+                continue
+            encontrado = PADROES[campo].search(texto)
+            if encontrado:
+                valor = encontrado.group(1)
+                campos[campo] = valor.replace(".", "") if campo == "numero_matricula" else _numero(valor)
+                break
+    return campos
+
+
+class ExtratorTextos:
+    """Extrai o texto dos PDFs guardados por um ColetorDocumentos e preenche os campos dos registros.
+
+    Uso: aplicar(registros, coletor.manifesto()) depois de coletor.coletar(registros).
+    """
+
+    def __init__(self, diretorio, processos=None):
+        self.diretorio = diretorio
+        self.processos = processos or os.cpu_count() or 1
+        self._conexao = sqlite3.connect(os.path.join(diretorio, "manifesto.db"))
+        with self._conexao:
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS textos (
+                    sha256 TEXT PRIMARY KEY,
+                    texto TEXT NOT NULL,
+                    paginas INTEGER NOT NULL,
+                    erro TEXT,
+                    extraido_em REAL NOT NULL
+                )"""
+            )
+        self.extraidos = 0
+        self.reaproveitados = 0
+        self.falhas = 0
+        self.ignorados = 0  # Documentos guardados que não são PDF
+
+    def _pdf(self, documento):
+        # Pelo tipo informado pelo site ou pelo conteúdo, não pela extensão: PDFs servidos
+        # como application/octet-stream podem ter sido guardados como .bin
+        tipo = (documento.get("tipo") or "").split(";")[0].strip().lower()
+        if tipo == "application/pdf" or documento["caminho"].lower().endswith(".pdf"):
+            return True
+        caminho = os.path.join(self.diretorio, documento["caminho"])
+        return os.path.exists(caminho) and e_pdf(caminho)
+
+    def textos(self, arquivos):
+        """{sha256: texto} dos arquivos em {sha256: caminho}, lendo só os que não estão no manifesto."""
+        resultado = {}
+        shas = list(arquivos)
+        for inicio in range(0, len(shas), 500):  # Limite de parâmetros por consulta do SQLite
+            bloco = shas[inicio:inicio + 500]
+            consulta = f"SELECT sha256, texto FROM textos WHERE sha256 IN ({','.join('?' * len(bloco))})"
+            resultado.update(self._conexao.execute(consulta, bloco).fetchall())
+        self.reaproveitados += len(resultado)
+
+        tarefas = [(sha256, caminho) for sha256, caminho in arquivos.items() if sha256 not in resultado]
+        if not tarefas:
+            return resultado
+        processos = min(self.processos, len(tarefas))
+        with ProcessPoolExecutor(max_workers=processos) as executor, self._conexao:
+            for sha256, texto, paginas, erro in executor.map(_extrair, tarefas, chunksize=TAREFAS_POR_ENVIO):
+                if erro:
+                    self.falhas += 1
+                    print(f"  [ERRO] Texto de {arquivos[sha256]}: {erro}")
+                else:
+                    self.extraidos += 1
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO textos (sha256, texto, paginas, erro, extraido_em) VALUES (?, ?, ?, ?, ?)",
+                    (sha256, texto, paginas, erro, time.time()),
+                )
+                resultado[sha256] = texto
+        return resultado
+
+    def aplicar(self, registros, manifesto):
+        """Grava textos_documentos e os campos de CAMPOS_DOCUMENTOS em cada registro.
+
+        `manifesto` é a lista de ColetorDocumentos.manifesto() (documentos de cada lote); só os
+        PDFs dos lotes de `registros` são lidos, não todo o histórico guardado.
+        """
+        links = {registro.get("link") for registro in registros}
+        por_lote = defaultdict(list)
+        arquivos = {}
+        pdfs = {}  # sha256 -> é PDF; cada arquivo é testado uma vez, mesmo compartilhado por vários lotes
+        for documento in manifesto:
+            if documento["lote"] not in links or not documento["caminho"]:
+                continue
+            sha256 = documento["sha256"]
+            if sha256 not in pdfs:
+                pdfs[sha256] = self._pdf(documento)
+                if not pdfs[sha256]:
+                    self.ignorados += 1
+            if not pdfs[sha256]:
+                continue
+            por_lote[documento["lote"]].append(documento)
+            arquivos[sha256] = os.path.join(self.diretorio, documento["caminho"])
+        textos = self.textos(arquivos)
+
+        for registro in registros:
+            textos_lote = {documento["nome"]: textos.get(documento["sha256"], "")
+                           for documento in por_lote.get(registro.get("link"), ())}
+            registro["textos_documentos"] = textos_lote
+            registro.update(campos_dos_textos(textos_lote))
+        return registros
+
+    def relatorio(self):
+        return (f"Textos: {self.extraidos} PDFs lidos, {self.reaproveitados} já extraídos, "
+                f"{self.falhas} falhas, {self.ignorados} não PDF ignorados ({self.processos} processos)")
+
+    def fechar(self):
+        self._conexao.close()